@@ -1,5 +1,7 @@
 """Configuration management for the content pipeline."""
 
+from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 from typing import Literal
 
@@ -7,39 +9,58 @@ import yaml
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
 
-class AIClaudeSettings(BaseSettings):
+
+@dataclass(slots=True, frozen=True)
+class AIClaudeSettings:
     """Claude AI settings."""
 
     model: str = "claude-sonnet-4-20250514"
     max_tokens: int = 8192
+    max_context_tokens: int = 200_000
+    prompt_caching: bool = True  # Cache long system prompts on Anthropic's side
 
 
-class AIOpenAISettings(BaseSettings):
+@dataclass(slots=True, frozen=True)
+class AIOpenAISettings:
     """OpenAI settings."""
 
     model: str = "gpt-4o"
     max_tokens: int = 8192
+    max_context_tokens: int = 128_000
 
 
-class AIOllamaSettings(BaseSettings):
+@dataclass(slots=True, frozen=True)
+class AIOllamaSettings:
     """Ollama AI settings for local development."""
 
     base_url: str = "http://localhost:11434/v1"
     model: str = "llama3.2"
     max_tokens: int = 8192
+    max_context_tokens: int = 32_768  # Context size the Ollama server is configured with
+    prewarm: bool = True  # Load the model in the background when the service is created
 
 
-class AISettings(BaseSettings):
+@dataclass(slots=True, frozen=True)
+class AISettings:
     """AI service settings."""
 
     provider: Literal["claude", "openai", "ollama"] = "claude"
-    claude: AIClaudeSettings = Field(default_factory=AIClaudeSettings)
-    openai: AIOpenAISettings = Field(default_factory=AIOpenAISettings)
-    ollama: AIOllamaSettings = Field(default_factory=AIOllamaSettings)
+    cache_enabled: bool = True  # Reuse responses to identical requests from disk
+    cache_ttl_days: int = 30  # Age after which cached responses are ignored
+    concurrency: int = 8  # Threads for concurrent requests (e.g. one per script section)
+    max_in_flight: int | None = None  # Cap on simultaneous requests (None for no cap)
+    claude: AIClaudeSettings = field(default_factory=AIClaudeSettings)
+    openai: AIOpenAISettings = field(default_factory=AIOpenAISettings)
+    ollama: AIOllamaSettings = field(default_factory=AIOllamaSettings)
 
 
-class ScriptSettings(BaseSettings):
+@dataclass(slots=True, frozen=True)
+class ScriptSettings:
     """Script generation settings."""
 
     default_duration: int = 10
@@ -47,7 +68,8 @@ class ScriptSettings(BaseSettings):
     language: str = "ko"
 
 
-class PresentationSettings(BaseSettings):
+@dataclass(slots=True, frozen=True)
+class PresentationSettings:
     """Presentation settings."""
 
     width: int = 1920
@@ -60,7 +82,8 @@ class PresentationSettings(BaseSettings):
     accent_color: str = "#4a90d9"
 
 
-class ElevenLabsSettings(BaseSettings):
+@dataclass(slots=True, frozen=True)
+class ElevenLabsSettings:
     """ElevenLabs TTS settings."""
 
     voice_id: str = "pNInz6obpgDQGcFmaJgB"
@@ -69,7 +92,8 @@ class ElevenLabsSettings(BaseSettings):
     similarity_boost: float = 0.75
 
 
-class GoogleTTSSettings(BaseSettings):
+@dataclass(slots=True, frozen=True)
+class GoogleTTSSettings:
     """Google Cloud TTS settings."""
 
     language_code: str = "ko-KR"
@@ -78,7 +102,8 @@ class GoogleTTSSettings(BaseSettings):
     pitch: float = 0.0
 
 
-class OpenAITTSSettings(BaseSettings):
+@dataclass(slots=True, frozen=True)
+class OpenAITTSSettings:
     """OpenAI TTS settings."""
 
     model: str = "tts-1-hd"
@@ -86,7 +111,8 @@ class OpenAITTSSettings(BaseSettings):
     speed: float = 1.0
 
 
-class LocalTTSSettings(BaseSettings):
+@dataclass(slots=True, frozen=True)
+class LocalTTSSettings:
     """Local TTS settings using pyttsx3 for development."""
 
     rate: int = 150  # Words per minute
@@ -94,17 +120,19 @@ class LocalTTSSettings(BaseSettings):
     voice_id: str | None = None  # System voice ID (None for default)
 
 
-class TTSSettings(BaseSettings):
+@dataclass(slots=True, frozen=True)
+class TTSSettings:
     """TTS settings."""
 
     provider: Literal["elevenlabs", "google", "openai", "local"] = "openai"
-    elevenlabs: ElevenLabsSettings = Field(default_factory=ElevenLabsSettings)
-    google: GoogleTTSSettings = Field(default_factory=GoogleTTSSettings)
-    openai: OpenAITTSSettings = Field(default_factory=OpenAITTSSettings)
-    local: LocalTTSSettings = Field(default_factory=LocalTTSSettings)
+    elevenlabs: ElevenLabsSettings = field(default_factory=ElevenLabsSettings)
+    google: GoogleTTSSettings = field(default_factory=GoogleTTSSettings)
+    openai: OpenAITTSSettings = field(default_factory=OpenAITTSSettings)
+    local: LocalTTSSettings = field(default_factory=LocalTTSSettings)
 
 
-class VideoSettings(BaseSettings):
+@dataclass(slots=True, frozen=True)
+class VideoSettings:
     """Video generation settings."""
 
     format: str = "mp4"
@@ -115,17 +143,25 @@ class VideoSettings(BaseSettings):
     audio_codec: str = "aac"
     bitrate: str = "8000k"
     transition_duration: float = 0.5
+    preset: str = "veryfast"  # x264 speed/quality preset (mapped to p1-p7 for NVENC)
+    threads: int | None = None  # Encoder threads (None for all CPU cores)
+    # "auto" uses the first working hardware encoder, "none" always uses `codec`
+    hwaccel: Literal["auto", "nvenc", "videotoolbox", "vaapi", "none"] = "auto"
 
 
-class YouTubeSettings(BaseSettings):
+@dataclass(slots=True, frozen=True)
+class YouTubeSettings:
     """YouTube upload settings."""
 
     privacy_status: Literal["public", "private", "unlisted"] = "private"
     category_id: str = "27"
-    default_tags: list[str] = Field(default_factory=lambda: ["교육", "강의", "자기계발"])
+    default_tags: list[str] = field(default_factory=lambda: ["교육", "강의", "자기계발"])
+    # Bytes sent per resumable upload request, rounded down to a multiple of 256 KiB
+    chunk_size: int = 8 * 1024 * 1024
 
 
-class OutputSettings(BaseSettings):
+@dataclass(slots=True, frozen=True)
+class OutputSettings:
     """Output settings."""
 
     base_dir: str = "output"
@@ -164,16 +200,36 @@ class Settings(BaseSettings):
         config_path = Path(config_path)
 
         if config_path.exists():
-            with open(config_path) as f:
-                yaml_config = yaml.safe_load(f) or {}
+            yaml_config = _load_yaml(str(config_path), config_path.stat().st_mtime_ns)
         else:
             yaml_config = {}
 
         return cls(**yaml_config)
 
 
+@lru_cache(maxsize=8)
+def _load_yaml(config_path: str, mtime_ns: int) -> dict:
+    """Parse a YAML config file, memoized on path and modification time."""
+    with open(config_path) as f:
+        return yaml.load(f, Loader=_YamlLoader) or {}
+
+
+@lru_cache(maxsize=8)
+def _get_cached_settings(config_path: str, mtime_ns: int) -> Settings:
+    """Build settings for a config file, memoized on path and modification time.
+
+    An empty path means no config file was found and only defaults/env are used.
+    """
+    if config_path:
+        return Settings.from_yaml(config_path)
+    return Settings()
+
+
 def get_settings(config_path: Path | str | None = None) -> Settings:
-    """Get application settings."""
+    """Get application settings.
+
+    Settings are cached per config file; editing the file invalidates the cache.
+    """
     if config_path is None:
         # Look for config in default locations
         possible_paths = [
@@ -187,8 +243,10 @@ def get_settings(config_path: Path | str | None = None) -> Settings:
                 break
 
     if config_path:
-        return Settings.from_yaml(config_path)
-    return Settings()
+        config_path = Path(config_path).resolve()
+        mtime_ns = config_path.stat().st_mtime_ns if config_path.exists() else 0
+        return _get_cached_settings(str(config_path), mtime_ns)
+    return _get_cached_settings("", 0)
 
 
 # Global settings instance
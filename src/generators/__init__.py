@@ -1,7 +1,7 @@
 """Content generators for script, presentation, TTS, and video."""
 
-from src.generators.script_generator import ScriptGenerator
 from src.generators.ppt_generator import PPTGenerator
+from src.generators.script_generator import ScriptGenerator
 from src.generators.tts_generator import TTSGenerator
 from src.generators.video_generator import VideoGenerator
 
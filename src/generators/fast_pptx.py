@@ -0,0 +1,315 @@
+"""Minimal PPTX writer for the fixed slide layouts used by PPTGenerator.
+
+Slides are emitted from XML string templates and the package is written with
+zipfile directly, instead of building a python-pptx object model. The slide
+master, layouts and themes are copied verbatim from python-pptx's bundled
+default template, so the output matches what python-pptx would produce.
+"""
+
+import importlib.util
+import re
+import zipfile
+from functools import lru_cache
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+# English Metric Units per pixel (at 96 DPI) and per inch
+EMU_PER_PX = 9525
+EMU_PER_INCH = 914400
+
+_REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_CT_PREFIX = "application/vnd.openxmlformats-officedocument"
+
+_XML_HEADER = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+_NAMESPACES = (
+    'xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" '
+    'xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main" '
+    f'xmlns:r="{_REL_NS}"'
+)
+
+TEMPLATES = {
+    "slide.xml": (
+        _XML_HEADER + f"<p:sld {_NAMESPACES}><p:cSld><p:spTree>"
+        '<p:nvGrpSpPr><p:cNvPr id="1" name=""/><p:cNvGrpSpPr/><p:nvPr/></p:nvGrpSpPr>'
+        "<p:grpSpPr/>{shapes}</p:spTree></p:cSld>"
+        "<p:clrMapOvr><a:masterClrMapping/></p:clrMapOvr></p:sld>"
+    ),
+    "textbox": (
+        '<p:sp><p:nvSpPr><p:cNvPr id="{shape_id}" name="TextBox {name_id}"/>'
+        '<p:cNvSpPr txBox="1"/><p:nvPr/></p:nvSpPr>'
+        '<p:spPr><a:xfrm><a:off x="{x}" y="{y}"/><a:ext cx="{cx}" cy="{cy}"/></a:xfrm>'
+        '<a:prstGeom prst="rect"><a:avLst/></a:prstGeom><a:noFill/></p:spPr>'
+        '<p:txBody><a:bodyPr wrap="{wrap}"><a:spAutoFit/></a:bodyPr><a:lstStyle/>'
+        "{paragraphs}</p:txBody></p:sp>"
+    ),
+    "paragraph": "<a:p>{ppr}{runs}</a:p>",
+    "run": "<a:r>{rpr}<a:t>{text}</a:t></a:r>",
+    "notes.xml": (
+        _XML_HEADER + f"<p:notes {_NAMESPACES}><p:cSld><p:spTree>"
+        '<p:nvGrpSpPr><p:cNvPr id="1" name=""/><p:cNvGrpSpPr/><p:nvPr/></p:nvGrpSpPr>'
+        '<p:grpSpPr><a:xfrm><a:off x="0" y="0"/><a:ext cx="0" cy="0"/>'
+        '<a:chOff x="0" y="0"/><a:chExt cx="0" cy="0"/></a:xfrm></p:grpSpPr>'
+        '<p:sp><p:nvSpPr><p:cNvPr id="2" name="Slide Image Placeholder 1"/>'
+        '<p:cNvSpPr><a:spLocks noGrp="1"/></p:cNvSpPr>'
+        '<p:nvPr><p:ph type="sldImg" idx="2"/></p:nvPr></p:nvSpPr><p:spPr/></p:sp>'
+        '<p:sp><p:nvSpPr><p:cNvPr id="3" name="Notes Placeholder 2"/>'
+        '<p:cNvSpPr><a:spLocks noGrp="1"/></p:cNvSpPr>'
+        '<p:nvPr><p:ph type="body" idx="3" sz="quarter"/></p:nvPr></p:nvSpPr><p:spPr/>'
+        "<p:txBody><a:bodyPr/><a:lstStyle/>{paragraphs}</p:txBody></p:sp>"
+        "</p:spTree></p:cSld><p:clrMapOvr><a:masterClrMapping/></p:clrMapOvr></p:notes>"
+    ),
+    "slide.xml.rels": (
+        _XML_HEADER + '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/'
+        'relationships"><Relationship Id="rId1" Type="' + _REL_NS + '/slideLayout" '
+        'Target="../slideLayouts/slideLayout7.xml"/>{notes_rel}</Relationships>'
+    ),
+    "notes_rel": (
+        '<Relationship Id="rId2" Type="' + _REL_NS + '/notesSlide" '
+        'Target="../notesSlides/notesSlide{number}.xml"/>'
+    ),
+    "notes.xml.rels": (
+        _XML_HEADER + '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/'
+        'relationships"><Relationship Id="rId1" Type="' + _REL_NS + '/notesMaster" '
+        'Target="../notesMasters/notesMaster1.xml"/><Relationship Id="rId2" '
+        'Type="' + _REL_NS + '/slide" Target="../slides/slide{number}.xml"/></Relationships>'
+    ),
+    "notesMaster.xml.rels": (
+        _XML_HEADER + '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/'
+        'relationships"><Relationship Id="rId1" Type="' + _REL_NS + '/theme" '
+        'Target="../theme/theme2.xml"/></Relationships>'
+    ),
+    "override": '<Override PartName="/{part}" ContentType="' + _CT_PREFIX + '.{content_type}"/>',
+    "relationship": (
+        '<Relationship Id="{rel_id}" Type="' + _REL_NS + '/{rel_type}" Target="{target}"/>'
+    ),
+}
+
+# Control characters that are not allowed in XML 1.0 text
+_INVALID_XML_CHARS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+# Parts regenerated for every presentation rather than copied from the template
+_GENERATED_PARTS = {
+    "[Content_Types].xml",
+    "ppt/presentation.xml",
+    "ppt/_rels/presentation.xml.rels",
+}
+
+
+@lru_cache(maxsize=1)
+def _template_parts() -> dict[str, bytes]:
+    """Load the master, layout and theme parts from python-pptx's default template."""
+    spec = importlib.util.find_spec("pptx")
+    if spec is None or not spec.submodule_search_locations:
+        raise ImportError("python-pptx is required for its default presentation template")
+    template_dir = Path(spec.submodule_search_locations[0]) / "templates"
+
+    with zipfile.ZipFile(template_dir / "default.pptx") as template:
+        parts = {name: template.read(name) for name in template.namelist()}
+    parts["ppt/notesMasters/notesMaster1.xml"] = (template_dir / "notesMaster.xml").read_bytes()
+    parts["ppt/theme/theme2.xml"] = (template_dir / "theme.xml").read_bytes()
+    return parts
+
+
+def px_to_emu(pixels: float) -> int:
+    """Convert pixels at 96 DPI to EMU."""
+    return int(pixels * EMU_PER_PX)
+
+
+def inches_to_emu(inches: float) -> int:
+    """Convert inches to EMU."""
+    return int(inches * EMU_PER_INCH)
+
+
+def paragraph_xml(
+    text: str,
+    size_pt: int | None = None,
+    color: str | None = None,
+    bold: bool = False,
+    align: str | None = None,
+    space_after_pt: int | None = None,
+) -> str:
+    """Build an <a:p> element with one run per line of text.
+
+    Color is a hex string such as "#1a1a2e"; align is a DrawingML value ("ctr").
+    """
+    ppr = ""
+    if align or space_after_pt is not None:
+        align_attr = f' algn="{align}"' if align else ""
+        spacing = (
+            f'<a:spcAft><a:spcPts val="{space_after_pt * 100}"/></a:spcAft>'
+            if space_after_pt is not None
+            else ""
+        )
+        ppr = f"<a:pPr{align_attr}>{spacing}</a:pPr>" if spacing else f"<a:pPr{align_attr}/>"
+
+    attrs = ' lang="ko-KR"'
+    if size_pt is not None:
+        attrs += f' sz="{size_pt * 100}"'
+    if bold:
+        attrs += ' b="1"'
+    fill = (
+        f'<a:solidFill><a:srgbClr val="{color.lstrip("#").upper()}"/></a:solidFill>'
+        if color
+        else ""
+    )
+    rpr = f"<a:rPr{attrs}>{fill}</a:rPr>" if fill else f"<a:rPr{attrs}/>"
+
+    runs = "<a:br/>".join(
+        TEMPLATES["run"].format(rpr=rpr, text=escape(_INVALID_XML_CHARS.sub("", line)))
+        for line in text.split("\n")
+    )
+    return TEMPLATES["paragraph"].format(ppr=ppr, runs=runs)
+
+
+def textbox_xml(
+    shape_id: int,
+    x: int,
+    y: int,
+    cx: int,
+    cy: int,
+    paragraphs: list[str],
+    word_wrap: bool = False,
+) -> str:
+    """Build a text box shape from pre-rendered paragraph XML (EMU coordinates)."""
+    return TEMPLATES["textbox"].format(
+        shape_id=shape_id,
+        name_id=shape_id - 1,
+        x=x,
+        y=y,
+        cx=cx,
+        cy=cy,
+        wrap="square" if word_wrap else "none",
+        paragraphs="".join(paragraphs),
+    )
+
+
+class FastPresentation:
+    """A presentation assembled from slide XML and written straight to a zip file."""
+
+    def __init__(self, width: int, height: int):
+        """Create an empty presentation with slide size in EMU."""
+        self.slide_width = width
+        self.slide_height = height
+        self._slides: list[tuple[str, str]] = []
+
+    def add_slide(self, shapes: list[str], notes: str = "") -> None:
+        """Append a blank-layout slide containing the given shape XML."""
+        self._slides.append(("".join(shapes), notes))
+
+    def save(self, path: Path | str) -> None:
+        """Write the presentation as an uncompressed .pptx package."""
+        template = _template_parts()
+        overrides = []
+        relationships = []
+        slide_ids = []
+
+        # Relationship IDs continue after the ones used by the template
+        rel_ids = re.findall(r'Id="rId(\d+)"', template["ppt/_rels/presentation.xml.rels"].decode())
+        next_rel = max(map(int, rel_ids), default=0) + 1
+
+        with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_STORED) as zf:
+            for name, data in template.items():
+                if name not in _GENERATED_PARTS:
+                    zf.writestr(name, data)
+
+            has_notes = any(notes for _, notes in self._slides)
+            if has_notes:
+                zf.writestr(
+                    "ppt/notesMasters/_rels/notesMaster1.xml.rels",
+                    TEMPLATES["notesMaster.xml.rels"],
+                )
+                overrides.append(
+                    TEMPLATES["override"].format(
+                        part="ppt/notesMasters/notesMaster1.xml",
+                        content_type="presentationml.notesMaster+xml",
+                    )
+                )
+                overrides.append(
+                    TEMPLATES["override"].format(
+                        part="ppt/theme/theme2.xml", content_type="theme+xml"
+                    )
+                )
+                notes_master_rel = f"rId{next_rel}"
+                next_rel += 1
+                relationships.append(
+                    TEMPLATES["relationship"].format(
+                        rel_id=notes_master_rel,
+                        rel_type="notesMaster",
+                        target="notesMasters/notesMaster1.xml",
+                    )
+                )
+
+            for number, (shapes, notes) in enumerate(self._slides, start=1):
+                zf.writestr(
+                    f"ppt/slides/slide{number}.xml",
+                    TEMPLATES["slide.xml"].format(shapes=shapes),
+                )
+                notes_rel = TEMPLATES["notes_rel"].format(number=number) if notes else ""
+                zf.writestr(
+                    f"ppt/slides/_rels/slide{number}.xml.rels",
+                    TEMPLATES["slide.xml.rels"].format(notes_rel=notes_rel),
+                )
+                overrides.append(
+                    TEMPLATES["override"].format(
+                        part=f"ppt/slides/slide{number}.xml",
+                        content_type="presentationml.slide+xml",
+                    )
+                )
+
+                if notes:
+                    paragraphs = "".join(paragraph_xml(line) for line in notes.split("\n"))
+                    zf.writestr(
+                        f"ppt/notesSlides/notesSlide{number}.xml",
+                        TEMPLATES["notes.xml"].format(paragraphs=paragraphs),
+                    )
+                    zf.writestr(
+                        f"ppt/notesSlides/_rels/notesSlide{number}.xml.rels",
+                        TEMPLATES["notes.xml.rels"].format(number=number),
+                    )
+                    overrides.append(
+                        TEMPLATES["override"].format(
+                            part=f"ppt/notesSlides/notesSlide{number}.xml",
+                            content_type="presentationml.notesSlide+xml",
+                        )
+                    )
+
+                rel_id = f"rId{next_rel}"
+                next_rel += 1
+                relationships.append(
+                    TEMPLATES["relationship"].format(
+                        rel_id=rel_id, rel_type="slide", target=f"slides/slide{number}.xml"
+                    )
+                )
+                slide_ids.append(f'<p:sldId id="{255 + number}" r:id="{rel_id}"/>')
+
+            content_types = template["[Content_Types].xml"].decode()
+            zf.writestr(
+                "[Content_Types].xml",
+                content_types.replace("</Types>", "".join(overrides) + "</Types>"),
+            )
+
+            rels = template["ppt/_rels/presentation.xml.rels"].decode()
+            zf.writestr(
+                "ppt/_rels/presentation.xml.rels",
+                rels.replace("</Relationships>", "".join(relationships) + "</Relationships>"),
+            )
+
+            lists = ""
+            if has_notes:
+                lists += (
+                    f'<p:notesMasterIdLst><p:notesMasterId r:id="{notes_master_rel}"/>'
+                    "</p:notesMasterIdLst>"
+                )
+            if slide_ids:
+                lists += f"<p:sldIdLst>{''.join(slide_ids)}</p:sldIdLst>"
+            presentation = template["ppt/presentation.xml"].decode()
+            presentation = presentation.replace(
+                "</p:sldMasterIdLst>", "</p:sldMasterIdLst>" + lists, 1
+            )
+            presentation = re.sub(
+                r"<p:sldSz [^>]*/>",
+                f'<p:sldSz cx="{self.slide_width}" cy="{self.slide_height}"/>',
+                presentation,
+                count=1,
+            )
+            zf.writestr("ppt/presentation.xml", presentation)
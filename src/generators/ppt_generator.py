@@ -1,17 +1,31 @@
 """PowerPoint presentation generator."""
 
+import multiprocessing
+import os
+from collections.abc import Generator
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import repeat
 from pathlib import Path
-
-from pptx import Presentation as PPTXPresentation
-from pptx.dml.color import RGBColor
-from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
-from pptx.util import Inches, Pt
+from typing import TYPE_CHECKING, Any
 
 from src.config import Settings, settings
+from src.generators.fast_pptx import (
+    FastPresentation,
+    inches_to_emu,
+    paragraph_xml,
+    px_to_emu,
+    textbox_xml,
+)
 from src.models.presentation import Presentation, Slide
 from src.models.script import Script
 from src.utils.helpers import ensure_dir, sanitize_filename
 
+if TYPE_CHECKING:
+    from PIL import Image, ImageDraw, ImageFont
+
+    SlideFont = ImageFont.FreeTypeFont | ImageFont.ImageFont
+
 
 class PPTGenerator:
     """Generator for creating PowerPoint presentations from scripts."""
@@ -19,27 +33,27 @@ class PPTGenerator:
     def __init__(self, config: Settings | None = None):
         self.config = config or settings()
         self.ppt_config = self.config.presentation
+        # Colors are fixed per config; convert once instead of per paragraph
+        self._title_rgb = self._hex_to_rgb(self.ppt_config.title_color)
+        self._body_rgb = self._hex_to_rgb(self.ppt_config.body_color)
 
-    def _hex_to_rgb(self, hex_color: str) -> RGBColor:
+    def _hex_to_rgb(self, hex_color: str) -> tuple[int, int, int]:
         """Convert hex color to RGB."""
-        hex_color = hex_color.lstrip("#")
-        r = int(hex_color[0:2], 16)
-        g = int(hex_color[2:4], 16)
-        b = int(hex_color[4:6], 16)
-        return RGBColor(r, g, b)
+        value = int(hex_color.lstrip("#"), 16)
+        return ((value >> 16) & 0xFF, (value >> 8) & 0xFF, value & 0xFF)
 
     def generate(self, script: Script, output_path: Path | str | None = None) -> Presentation:
         """Generate a PowerPoint presentation from a script."""
-        prs = PPTXPresentation()
-
-        # Set slide dimensions (16:9)
-        prs.slide_width = Inches(self.ppt_config.width / 96)  # Convert pixels to inches
-        prs.slide_height = Inches(self.ppt_config.height / 96)
+        # Set slide dimensions (16:9), converting pixels to EMU
+        prs = FastPresentation(
+            width=px_to_emu(self.ppt_config.width),
+            height=px_to_emu(self.ppt_config.height),
+        )
 
         slides = []
 
         # Create title slide
-        title_slide = self._create_title_slide(prs, script.title, script.description)
+        self._create_title_slide(prs, script.title, script.description)
         slides.append(
             Slide(
                 slide_index=0,
@@ -51,7 +65,7 @@ class PPTGenerator:
 
         # Create content slides from sections
         for i, section in enumerate(script.sections):
-            content_slide = self._create_content_slide(
+            self._create_content_slide(
                 prs,
                 section.title,
                 section.key_points,
@@ -61,7 +75,7 @@ class PPTGenerator:
                 Slide(
                     slide_index=i + 1,
                     title=section.title,
-                    content=section.key_points,
+                    content=list(section.key_points),
                     notes=section.content,
                 )
             )
@@ -76,9 +90,10 @@ class PPTGenerator:
             ensure_dir(output_path.parent)
 
         # Save presentation
-        prs.save(str(output_path))
+        prs.save(output_path)
 
-        return Presentation(
+        # Slides are built from an already-validated Script, so skip re-validation
+        return Presentation.model_construct(
             title=script.title,
             slides=slides,
             file_path=output_path,
@@ -86,100 +101,104 @@ class PPTGenerator:
 
     def _create_title_slide(
         self,
-        prs: PPTXPresentation,
+        prs: FastPresentation,
         title: str,
         subtitle: str,
-    ):
+    ) -> None:
         """Create the title slide."""
-        # Use blank layout and add shapes manually for more control
-        blank_layout = prs.slide_layouts[6]  # Blank layout
-        slide = prs.slides.add_slide(blank_layout)
-
-        # Add title
-        title_box = slide.shapes.add_textbox(
-            Inches(0.5),
-            Inches(3),
-            prs.slide_width - Inches(1),
-            Inches(1.5),
-        )
-        title_frame = title_box.text_frame
-        title_para = title_frame.paragraphs[0]
-        title_para.text = title
-        title_para.font.size = Pt(self.ppt_config.title_font_size + 10)
-        title_para.font.bold = True
-        title_para.font.color.rgb = self._hex_to_rgb(self.ppt_config.title_color)
-        title_para.alignment = PP_ALIGN.CENTER
+        # Blank layout with text boxes added manually for more control
+        shapes = [
+            textbox_xml(
+                2,
+                inches_to_emu(0.5),
+                inches_to_emu(3),
+                prs.slide_width - inches_to_emu(1),
+                inches_to_emu(1.5),
+                [
+                    paragraph_xml(
+                        title,
+                        size_pt=self.ppt_config.title_font_size + 10,
+                        color=self.ppt_config.title_color,
+                        bold=True,
+                        align="ctr",
+                    )
+                ],
+            )
+        ]
 
         # Add subtitle
         if subtitle:
-            subtitle_box = slide.shapes.add_textbox(
-                Inches(1),
-                Inches(4.5),
-                prs.slide_width - Inches(2),
-                Inches(1),
+            shapes.append(
+                textbox_xml(
+                    3,
+                    inches_to_emu(1),
+                    inches_to_emu(4.5),
+                    prs.slide_width - inches_to_emu(2),
+                    inches_to_emu(1),
+                    [
+                        paragraph_xml(
+                            subtitle,
+                            size_pt=self.ppt_config.body_font_size,
+                            color=self.ppt_config.body_color,
+                            align="ctr",
+                        )
+                    ],
+                )
             )
-            subtitle_frame = subtitle_box.text_frame
-            subtitle_para = subtitle_frame.paragraphs[0]
-            subtitle_para.text = subtitle
-            subtitle_para.font.size = Pt(self.ppt_config.body_font_size)
-            subtitle_para.font.color.rgb = self._hex_to_rgb(self.ppt_config.body_color)
-            subtitle_para.alignment = PP_ALIGN.CENTER
 
-        return slide
+        prs.add_slide(shapes)
 
     def _create_content_slide(
         self,
-        prs: PPTXPresentation,
+        prs: FastPresentation,
         title: str,
         bullet_points: list[str],
         notes: str,
-    ):
+    ) -> None:
         """Create a content slide with title and bullet points."""
-        blank_layout = prs.slide_layouts[6]
-        slide = prs.slides.add_slide(blank_layout)
-
-        # Add title
-        title_box = slide.shapes.add_textbox(
-            Inches(0.5),
-            Inches(0.5),
-            prs.slide_width - Inches(1),
-            Inches(1),
-        )
-        title_frame = title_box.text_frame
-        title_para = title_frame.paragraphs[0]
-        title_para.text = title
-        title_para.font.size = Pt(self.ppt_config.title_font_size)
-        title_para.font.bold = True
-        title_para.font.color.rgb = self._hex_to_rgb(self.ppt_config.title_color)
+        shapes = [
+            textbox_xml(
+                2,
+                inches_to_emu(0.5),
+                inches_to_emu(0.5),
+                prs.slide_width - inches_to_emu(1),
+                inches_to_emu(1),
+                [
+                    paragraph_xml(
+                        title,
+                        size_pt=self.ppt_config.title_font_size,
+                        color=self.ppt_config.title_color,
+                        bold=True,
+                    )
+                ],
+            )
+        ]
 
         # Add bullet points
         if bullet_points:
-            content_box = slide.shapes.add_textbox(
-                Inches(0.75),
-                Inches(1.75),
-                prs.slide_width - Inches(1.5),
-                Inches(5),
+            paragraphs = [
+                paragraph_xml(
+                    f"• {point}",
+                    size_pt=self.ppt_config.body_font_size,
+                    color=self.ppt_config.body_color,
+                    space_after_pt=12,
+                )
+                for point in bullet_points
+            ]
+            shapes.append(
+                textbox_xml(
+                    3,
+                    inches_to_emu(0.75),
+                    inches_to_emu(1.75),
+                    prs.slide_width - inches_to_emu(1.5),
+                    inches_to_emu(5),
+                    paragraphs,
+                    word_wrap=True,
+                )
             )
-            content_frame = content_box.text_frame
-            content_frame.word_wrap = True
-
-            for i, point in enumerate(bullet_points):
-                if i == 0:
-                    para = content_frame.paragraphs[0]
-                else:
-                    para = content_frame.add_paragraph()
-
-                para.text = f"• {point}"
-                para.font.size = Pt(self.ppt_config.body_font_size)
-                para.font.color.rgb = self._hex_to_rgb(self.ppt_config.body_color)
-                para.space_after = Pt(12)
 
         # Add speaker notes
-        if notes:
-            notes_slide = slide.notes_slide
-            notes_slide.notes_text_frame.text = notes
-
-        return slide
+        prs.add_slide(shapes, notes=notes)
 
     def export_slides_as_images(
         self,
@@ -191,6 +210,18 @@ class PPTGenerator:
         Note: This requires LibreOffice or unoconv to be installed.
         Alternative: Use python-pptx-to-image or similar library.
         """
+        return [path for _, path in self.iter_export_slides_as_images(presentation, output_dir)]
+
+    def iter_export_slides_as_images(
+        self,
+        presentation: Presentation,
+        output_dir: Path | str | None = None,
+    ) -> Generator[tuple[int, Path], None, None]:
+        """Export slides as images, yielding (slide_index, path) as each one is written.
+
+        Slides are yielded in order, so consumers can start on early slides while
+        later ones are still rendering.
+        """
         if presentation.file_path is None:
             raise ValueError("Presentation file path is not set")
 
@@ -203,50 +234,116 @@ class PPTGenerator:
 
         # For now, we'll use a placeholder that creates simple images
         # In production, you'd use LibreOffice or a conversion service
-        image_paths = []
-
         try:
-            from PIL import Image, ImageDraw, ImageFont
+            import PIL  # noqa: F401
         except ImportError:
             raise ImportError("Pillow is required for image generation")
 
-        for slide in presentation.slides:
-            img = Image.new(
-                "RGB",
-                (self.ppt_config.width, self.ppt_config.height),
-                color=self.ppt_config.background_color,
-            )
-            draw = ImageDraw.Draw(img)
-
-            # Try to use a system font, fall back to default
-            try:
-                title_font = ImageFont.truetype("/System/Library/Fonts/AppleSDGothicNeo.ttc", 60)
-                body_font = ImageFont.truetype("/System/Library/Fonts/AppleSDGothicNeo.ttc", 36)
-            except (OSError, IOError):
-                title_font = ImageFont.load_default()
-                body_font = ImageFont.load_default()
-
-            # Draw title
-            title_color = tuple(
-                int(self.ppt_config.title_color.lstrip("#")[i : i + 2], 16) for i in (0, 2, 4)
+        style = {
+            "width": self.ppt_config.width,
+            "height": self.ppt_config.height,
+            "background_color": self.ppt_config.background_color,
+            "title_color": self._title_rgb,
+            "body_color": self._body_rgb,
+        }
+        slides = presentation.slides
+        slide_data = [
+            {"slide_index": slide.slide_index, "title": slide.title, "content": slide.content}
+            for slide in slides
+        ]
+
+        # Rendering and PNG encoding are CPU-bound and independent per slide
+        workers = min(os.cpu_count() or 1, len(slides))
+        if workers > 1:
+            # Forking while other threads run (e.g. TTS during the pipeline) can leave
+            # children stuck on locks held at fork time, so start from a clean process
+            start_method = (
+                "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
             )
-            draw.text((100, 80), slide.title, font=title_font, fill=title_color)
-
-            # Draw content
-            body_color = tuple(
-                int(self.ppt_config.body_color.lstrip("#")[i : i + 2], 16) for i in (0, 2, 4)
+            executor = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context(start_method)
             )
-            y_pos = 200
-            for point in slide.content:
-                draw.text((120, y_pos), f"• {point}", font=body_font, fill=body_color)
-                y_pos += 60
-
-            # Save image
-            image_path = output_dir / f"slide_{slide.slide_index:03d}.png"
-            img.save(str(image_path))
-            image_paths.append(image_path)
-
-            # Update slide with image path
-            slide.image_path = image_path
-
-        return image_paths
+            try:
+                image_paths = executor.map(
+                    _render_slide,
+                    slide_data,
+                    repeat(style),
+                    repeat(str(output_dir)),
+                )
+                for slide, image_path in zip(slides, image_paths):
+                    slide.image_path = image_path
+                    yield slide.slide_index, image_path
+            finally:
+                # Drops slides not yet started if the caller stops iterating early
+                executor.shutdown(cancel_futures=True)
+        else:
+            for slide, data in zip(slides, slide_data):
+                slide.image_path = _render_slide(data, style, str(output_dir))
+                yield slide.slide_index, slide.image_path
+
+
+@lru_cache(maxsize=1)
+def _load_slide_fonts() -> tuple["SlideFont", "SlideFont"]:
+    """Load title and body fonts for slide images, falling back to the default font."""
+    from PIL import ImageFont
+
+    # Try to use a system font, fall back to default
+    title_font: SlideFont
+    body_font: SlideFont
+    try:
+        title_font = ImageFont.truetype("/System/Library/Fonts/AppleSDGothicNeo.ttc", 60)
+        body_font = ImageFont.truetype("/System/Library/Fonts/AppleSDGothicNeo.ttc", 36)
+    except OSError:
+        title_font = ImageFont.load_default()
+        body_font = ImageFont.load_default()
+    return title_font, body_font
+
+
+@lru_cache(maxsize=4)
+def _blank_slide(width: int, height: int, background_color: str) -> "Image.Image":
+    """Create a blank slide background, reused as a template for every slide."""
+    from PIL import Image
+
+    return Image.new("RGB", (width, height), color=background_color)
+
+
+def _draw_slide_text(
+    draw: "ImageDraw.ImageDraw",
+    title: str,
+    content: list[str],
+    title_color: tuple[int, int, int],
+    body_color: tuple[int, int, int],
+) -> None:
+    """Draw the title and bullet points onto a slide image."""
+    title_font, body_font = _load_slide_fonts()
+    draw_text = draw.text
+
+    # Draw title
+    draw_text((100, 80), title, font=title_font, fill=title_color)
+
+    # Draw content, one bullet per 60px line
+    for y_pos, point in zip(range(200, 200 + 60 * len(content), 60), content):
+        draw_text((120, y_pos), f"• {point}", font=body_font, fill=body_color)
+
+
+def _render_slide(slide_data: dict[str, Any], style: dict[str, Any], output_dir: str) -> Path:
+    """Render a single slide to a PNG image.
+
+    Takes plain picklable arguments so it can run in a worker process.
+    """
+    from PIL import ImageDraw
+
+    img = _blank_slide(style["width"], style["height"], style["background_color"]).copy()
+    _draw_slide_text(
+        ImageDraw.Draw(img),
+        slide_data["title"],
+        slide_data["content"],
+        style["title_color"],
+        style["body_color"],
+    )
+
+    # Save image. Slides are intermediates for the video encoder, so favour
+    # encode speed over file size.
+    image_path = Path(output_dir) / f"slide_{slide_data['slide_index']:03d}.png"
+    img.save(str(image_path), format="PNG", compress_level=1)
+    return image_path
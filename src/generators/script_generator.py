@@ -1,10 +1,10 @@
 """Script generator using AI services."""
 
+from string import Template
+
 from src.config import Settings, settings
 from src.models.script import Script, ScriptInput, ScriptSection
 from src.services.ai_service import AIService, get_ai_service
-from src.utils.helpers import estimate_speech_duration
-
 
 SCRIPT_SYSTEM_PROMPT = """당신은 교육 콘텐츠 전문 작가입니다.
 주어진 주제와 스토리라인을 바탕으로 일인칭 시점의 강의 대본을 작성합니다.
@@ -20,26 +20,26 @@ SCRIPT_SYSTEM_PROMPT = """당신은 교육 콘텐츠 전문 작가입니다.
 
 SCRIPT_GENERATION_PROMPT = """다음 정보를 바탕으로 강의 대본을 작성해주세요.
 
-주제: {topic}
-스토리라인: {storyline}
-목표 시간: {duration_minutes}분
-말투/톤: {tone}
+주제: $topic
+스토리라인: $storyline
+목표 시간: $duration_minutes분
+말투/톤: $tone
 
 다음 JSON 형식으로 응답해주세요:
-{{
+{
     "title": "프레젠테이션 제목",
     "description": "영상 설명 (2-3문장)",
     "sections": [
-        {{
+        {
             "section_id": 1,
             "title": "섹션 제목 (슬라이드 제목으로 사용)",
             "content": "이 섹션의 전체 대본 내용. 청중에게 말하듯이 자연스럽게 작성.",
             "key_points": ["핵심 포인트 1", "핵심 포인트 2", "핵심 포인트 3"],
             "slide_notes": "슬라이드에 추가할 시각적 요소 제안"
-        }}
+        }
     ],
     "tags": ["태그1", "태그2", "태그3"]
-}}
+}
 
 주의사항:
 - 섹션 수는 목표 시간에 맞게 조절 (보통 1분당 1-2개 섹션)
@@ -47,6 +47,9 @@ SCRIPT_GENERATION_PROMPT = """다음 정보를 바탕으로 강의 대본을 작
 - 인트로와 아웃트로 섹션 필수 포함
 - 한국어로 작성"""
 
+# Placeholders are parsed once here rather than on every generate() call
+_SCRIPT_GENERATION_TEMPLATE = Template(SCRIPT_GENERATION_PROMPT)
+
 
 class ScriptGenerator:
     """Generator for creating scripts from topics and storylines."""
@@ -61,7 +64,7 @@ class ScriptGenerator:
 
     def generate(self, script_input: ScriptInput) -> Script:
         """Generate a complete script from input."""
-        prompt = SCRIPT_GENERATION_PROMPT.format(
+        prompt = _SCRIPT_GENERATION_TEMPLATE.substitute(
             topic=script_input.topic,
             storyline=script_input.storyline,
             duration_minutes=script_input.duration_minutes,
@@ -70,26 +73,8 @@ class ScriptGenerator:
 
         response = self.ai_service.generate_json(prompt, SCRIPT_SYSTEM_PROMPT)
 
-        # Parse sections
-        sections = []
-        for section_data in response.get("sections", []):
-            section = ScriptSection(
-                section_id=section_data["section_id"],
-                title=section_data["title"],
-                content=section_data["content"],
-                key_points=section_data.get("key_points", []),
-                slide_notes=section_data.get("slide_notes", ""),
-                estimated_duration_sec=estimate_speech_duration(section_data["content"]),
-            )
-            sections.append(section)
-
-        # Create script
-        script = Script(
-            title=response.get("title", script_input.topic),
-            description=response.get("description", ""),
-            sections=sections,
-            tags=response.get("tags", []),
-        )
+        # Sections estimate their own duration when the response doesn't give one
+        script = Script.model_validate({"title": script_input.topic, **response})
 
         script.calculate_total_duration()
         return script
@@ -101,7 +86,36 @@ class ScriptGenerator:
 
     def enhance_section(self, section: ScriptSection, instruction: str) -> ScriptSection:
         """Enhance a specific section with additional instructions."""
-        prompt = f"""다음 대본 섹션을 개선해주세요.
+        response = self.ai_service.generate_json(
+            self._enhance_prompt(section, instruction), SCRIPT_SYSTEM_PROMPT
+        )
+        return self._enhanced_section(section, response)
+
+    async def enhance_section_async(
+        self, section: ScriptSection, instruction: str
+    ) -> ScriptSection:
+        """Enhance a specific section without blocking the event loop."""
+        response = await self.ai_service.generate_json_async(
+            self._enhance_prompt(section, instruction), SCRIPT_SYSTEM_PROMPT
+        )
+        return self._enhanced_section(section, response)
+
+    def enhance_sections(
+        self, sections: list[ScriptSection], instruction: str
+    ) -> list[ScriptSection]:
+        """Enhance several sections concurrently, preserving their order."""
+        responses = self.ai_service.generate_json_many(
+            [(self._enhance_prompt(s, instruction), SCRIPT_SYSTEM_PROMPT) for s in sections]
+        )
+        return [
+            self._enhanced_section(section, response)
+            for section, response in zip(sections, responses)
+        ]
+
+    @staticmethod
+    def _enhance_prompt(section: ScriptSection, instruction: str) -> str:
+        """Build the prompt for enhancing a section."""
+        return f"""다음 대본 섹션을 개선해주세요.
 
 현재 내용:
 제목: {section.title}
@@ -118,15 +132,13 @@ class ScriptGenerator:
     "slide_notes": "슬라이드 제안"
 }}"""
 
-        response = self.ai_service.generate_json(prompt, SCRIPT_SYSTEM_PROMPT)
-
+    @staticmethod
+    def _enhanced_section(section: ScriptSection, response: dict) -> ScriptSection:
+        """Merge an enhancement response into a copy of the section."""
         return ScriptSection(
             section_id=section.section_id,
             title=response.get("title", section.title),
             content=response.get("content", section.content),
             key_points=response.get("key_points", section.key_points),
             slide_notes=response.get("slide_notes", section.slide_notes),
-            estimated_duration_sec=estimate_speech_duration(
-                response.get("content", section.content)
-            ),
         )
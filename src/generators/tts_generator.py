@@ -1,16 +1,41 @@
 """TTS (Text-to-Speech) generator supporting multiple providers."""
 
+import tempfile
+import threading
+import wave
 from abc import ABC, abstractmethod
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+from functools import cached_property
 from pathlib import Path
+from xml.sax.saxutils import escape
 
 from src.config import Settings, settings
 from src.models.script import Script, ScriptSection
+from src.utils.ffmpeg import cut_audio
 from src.utils.helpers import ensure_dir, sanitize_filename
+from src.utils.http import keepalive_http_client
+
+# Upper bound on concurrent TTS requests, to stay within provider rate limits
+MAX_TTS_WORKERS = 8
+
+# Google Cloud TTS rejects SSML inputs larger than 5000 bytes
+MAX_SSML_BYTES = 5000
+SSML_ENVELOPE_BYTES = len("<speak></speak>")
+SSML_MARK_BYTES = len('<mark name="s000"/> ')
+
+
+def _raise_if_cancelled(cancel: threading.Event | None) -> None:
+    """Raise CancelledError if the cancel event is set."""
+    if cancel is not None and cancel.is_set():
+        raise CancelledError("TTS generation was cancelled")
 
 
 class TTSProvider(ABC):
     """Abstract base class for TTS providers."""
 
+    # Whether synthesize_batched is cheaper than one synthesize call per text
+    supports_batching = False
+
     @abstractmethod
     def synthesize(self, text: str, output_path: Path) -> float:
         """Synthesize speech from text.
@@ -19,6 +44,54 @@ class TTSProvider(ABC):
         """
         pass
 
+    def synthesize_batched(
+        self,
+        texts: list[str],
+        output_paths: list[Path],
+        cancel: threading.Event | None = None,
+    ) -> list[float]:
+        """Synthesize several texts, one output file each.
+
+        Providers that can return time-aligned audio for multiple texts in a
+        single request override this; the default synthesizes them one by one.
+        Setting `cancel` stops requests not yet sent and raises CancelledError.
+        Returns the duration of each audio file in seconds.
+        """
+        durations = []
+        for text, path in zip(texts, output_paths):
+            _raise_if_cancelled(cancel)
+            durations.append(self.synthesize(text, path))
+        return durations
+
+    def connect(self) -> None:
+        """Create the provider's clients before they are used from several threads.
+
+        cached_property has no lock from Python 3.12 on, so threads racing to
+        first use a client could each build one, leaking all but the last.
+        """
+        for name in ("http_client", "client"):
+            if hasattr(type(self), name):
+                getattr(self, name)
+
+    def close(self) -> None:
+        """Release the provider's HTTP connections, if any were opened."""
+        http_client = self.__dict__.pop("http_client", None)
+        if http_client is not None:
+            http_client.close()
+
+    def _get_audio_duration(self, audio_path: Path) -> float:
+        """Get the duration of an MP3 audio file."""
+        try:
+            from mutagen.mp3 import MP3
+        except ImportError:
+            # Fallback: estimate based on file size
+            # Rough estimate: 16kbps mono = 2KB/sec
+            file_size = audio_path.stat().st_size
+            return file_size / 2000
+
+        audio = MP3(str(audio_path))
+        return audio.info.length
+
 
 class ElevenLabsTTS(TTSProvider):
     """ElevenLabs TTS provider."""
@@ -27,14 +100,20 @@ class ElevenLabsTTS(TTSProvider):
         self.config = config
         self.tts_config = config.tts.elevenlabs
 
+    @cached_property
+    def http_client(self):
+        """Keep-alive HTTP client shared by all requests."""
+        return keepalive_http_client(timeout=240, max_keepalive_connections=MAX_TTS_WORKERS)
+
+    @cached_property
+    def client(self):
+        """ElevenLabs client, created on first use."""
         from elevenlabs import ElevenLabs
 
-        self.client = ElevenLabs(api_key=config.elevenlabs_api_key)
+        return ElevenLabs(api_key=self.config.elevenlabs_api_key, httpx_client=self.http_client)
 
     def synthesize(self, text: str, output_path: Path) -> float:
         """Synthesize speech using ElevenLabs."""
-        from elevenlabs import save
-
         audio = self.client.text_to_speech.convert(
             voice_id=self.tts_config.voice_id,
             text=text,
@@ -45,37 +124,35 @@ class ElevenLabsTTS(TTSProvider):
             },
         )
 
-        # Save audio file
-        save(audio, str(output_path))
+        # Write chunks as they arrive instead of buffering the whole response
+        with open(output_path, "wb") as f:
+            for chunk in audio:
+                f.write(chunk)
 
         # Get duration
         return self._get_audio_duration(output_path)
 
-    def _get_audio_duration(self, audio_path: Path) -> float:
-        """Get the duration of an audio file."""
-        try:
-            from mutagen.mp3 import MP3
-
-            audio = MP3(str(audio_path))
-            return audio.info.length
-        except ImportError:
-            # Fallback: estimate based on file size
-            # Rough estimate: 16kbps mono = 2KB/sec
-            file_size = audio_path.stat().st_size
-            return file_size / 2000
-
 
 class GoogleTTS(TTSProvider):
     """Google Cloud TTS provider."""
 
+    supports_batching = True
+
     def __init__(self, config: Settings):
         self.config = config
         self.tts_config = config.tts.google
 
+    @cached_property
+    def texttospeech(self):
+        """Google Cloud TTS module, imported on first use."""
         from google.cloud import texttospeech
 
-        self.client = texttospeech.TextToSpeechClient()
-        self.texttospeech = texttospeech
+        return texttospeech
+
+    @cached_property
+    def client(self):
+        """Google Cloud TTS client, created on first use."""
+        return self.texttospeech.TextToSpeechClient()
 
     def synthesize(self, text: str, output_path: Path) -> float:
         """Synthesize speech using Google Cloud TTS."""
@@ -104,16 +181,100 @@ class GoogleTTS(TTSProvider):
 
         return self._get_audio_duration(output_path)
 
-    def _get_audio_duration(self, audio_path: Path) -> float:
-        """Get the duration of an audio file."""
-        try:
-            from mutagen.mp3 import MP3
+    def synthesize_batched(
+        self,
+        texts: list[str],
+        output_paths: list[Path],
+        cancel: threading.Event | None = None,
+    ) -> list[float]:
+        """Synthesize texts with as few requests as possible.
+
+        Texts are packed into SSML documents with a <mark> before each one, and
+        the returned mark timepoints are used to cut the audio back into one
+        file per text. Setting `cancel` stops batches not yet sent.
+        """
+        durations = []
+        for batch in self._group_for_ssml(list(zip(texts, output_paths))):
+            _raise_if_cancelled(cancel)
+            if len(batch) == 1:
+                text, output_path = batch[0]
+                durations.append(self.synthesize(text, output_path))
+            else:
+                durations.extend(self._synthesize_ssml_batch(batch))
+        return durations
+
+    def _group_for_ssml(self, items: list[tuple[str, Path]]) -> list[list[tuple[str, Path]]]:
+        """Group texts into batches that fit within the SSML request size limit."""
+        batches: list[list[tuple[str, Path]]] = []
+        current: list[tuple[str, Path]] = []
+        current_size = SSML_ENVELOPE_BYTES
+        for text, output_path in items:
+            size = len(escape(text).encode("utf-8")) + SSML_MARK_BYTES
+            if current and current_size + size > MAX_SSML_BYTES:
+                batches.append(current)
+                current, current_size = [], SSML_ENVELOPE_BYTES
+            current.append((text, output_path))
+            current_size += size
+        if current:
+            batches.append(current)
+        return batches
+
+    def _synthesize_ssml_batch(self, batch: list[tuple[str, Path]]) -> list[float]:
+        """Synthesize a batch in one request and split it on SSML marks."""
+        from google.cloud import texttospeech_v1beta1 as tts_beta
+
+        ssml = (
+            "<speak>"
+            + "".join(f'<mark name="s{i}"/>{escape(text)} ' for i, (text, _) in enumerate(batch))
+            + "</speak>"
+        )
 
-            audio = MP3(str(audio_path))
-            return audio.info.length
-        except ImportError:
-            file_size = audio_path.stat().st_size
-            return file_size / 2000
+        request = tts_beta.SynthesizeSpeechRequest(
+            input=tts_beta.SynthesisInput(ssml=ssml),
+            voice=tts_beta.VoiceSelectionParams(
+                language_code=self.tts_config.language_code,
+                name=self.tts_config.voice_name,
+            ),
+            audio_config=tts_beta.AudioConfig(
+                audio_encoding=tts_beta.AudioEncoding.MP3,
+                speaking_rate=self.tts_config.speaking_rate,
+                pitch=self.tts_config.pitch,
+            ),
+            enable_time_pointing=[tts_beta.SynthesizeSpeechRequest.TimepointType.SSML_MARK],
+        )
+        response = self.beta_client.synthesize_speech(request=request)
+
+        marks = {tp.mark_name: tp.time_seconds for tp in response.timepoints}
+        starts = [marks.get(f"s{i}") for i in range(len(batch))]
+        if any(start is None for start in starts):
+            # Timepoints missing; fall back to one request per text
+            return [self.synthesize(text, output_path) for text, output_path in batch]
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            combined_path = Path(tmpdir) / "combined.mp3"
+            combined_path.write_bytes(response.audio_content)
+
+            durations = []
+            for i, (_, output_path) in enumerate(batch):
+                end = starts[i + 1] if i + 1 < len(batch) else None
+                length = end - starts[i] if end is not None else None
+                cut_audio(combined_path, output_path, starts[i], length)
+                durations.append(self._get_audio_duration(output_path))
+        return durations
+
+    @cached_property
+    def beta_client(self):
+        """Google Cloud TTS v1beta1 client (needed for SSML mark timepoints)."""
+        from google.cloud import texttospeech_v1beta1
+
+        return texttospeech_v1beta1.TextToSpeechClient()
+
+    def close(self) -> None:
+        """Close the gRPC channels of any clients that were created."""
+        for name in ("client", "beta_client"):
+            client = self.__dict__.pop(name, None)
+            if client is not None:
+                client.transport.close()
 
 
 class OpenAITTS(TTSProvider):
@@ -123,35 +284,31 @@ class OpenAITTS(TTSProvider):
         self.config = config
         self.tts_config = config.tts.openai
 
+    @cached_property
+    def http_client(self):
+        """Keep-alive HTTP client shared by all requests."""
+        return keepalive_http_client(timeout=600, max_keepalive_connections=MAX_TTS_WORKERS)
+
+    @cached_property
+    def client(self):
+        """OpenAI client, created on first use."""
         import openai
 
-        self.client = openai.OpenAI(api_key=config.openai_api_key)
+        return openai.OpenAI(api_key=self.config.openai_api_key, http_client=self.http_client)
 
     def synthesize(self, text: str, output_path: Path) -> float:
         """Synthesize speech using OpenAI TTS."""
-        response = self.client.audio.speech.create(
+        # Stream the response body straight to disk
+        with self.client.audio.speech.with_streaming_response.create(
             model=self.tts_config.model,
             voice=self.tts_config.voice,
             input=text,
             speed=self.tts_config.speed,
-        )
-
-        # Save audio file
-        response.stream_to_file(str(output_path))
+        ) as response:
+            response.stream_to_file(str(output_path))
 
         return self._get_audio_duration(output_path)
 
-    def _get_audio_duration(self, audio_path: Path) -> float:
-        """Get the duration of an audio file."""
-        try:
-            from mutagen.mp3 import MP3
-
-            audio = MP3(str(audio_path))
-            return audio.info.length
-        except ImportError:
-            file_size = audio_path.stat().st_size
-            return file_size / 2000
-
 
 class LocalTTS(TTSProvider):
     """Local TTS provider using pyttsx3."""
@@ -160,23 +317,27 @@ class LocalTTS(TTSProvider):
         self.config = config
         self.tts_config = config.tts.local
 
+    @cached_property
+    def engine(self):
+        """pyttsx3 engine, initialized on first use."""
         import pyttsx3
-        
+
         try:
-            self.engine = pyttsx3.init()
-            self.engine.setProperty("rate", self.tts_config.rate)
-            self.engine.setProperty("volume", self.tts_config.volume)
+            engine = pyttsx3.init()
+            engine.setProperty("rate", self.tts_config.rate)
+            engine.setProperty("volume", self.tts_config.volume)
             if self.tts_config.voice_id:
-                self.engine.setProperty("voice", self.tts_config.voice_id)
+                engine.setProperty("voice", self.tts_config.voice_id)
         except Exception as e:
             print(f"Warning: Failed to initialize Local TTS: {e}")
-            self.engine = None
+            return None
+        return engine
 
     def synthesize(self, text: str, output_path: Path) -> float:
         """Synthesize speech using local TTS."""
         if self.engine is None:
             raise RuntimeError("Local TTS engine is not initialized.")
-            
+
         output_path = output_path.with_suffix(".wav")
         self.engine.save_to_file(text, str(output_path))
         self.engine.runAndWait()
@@ -185,8 +346,6 @@ class LocalTTS(TTSProvider):
 
     def _get_audio_duration(self, audio_path: Path) -> float:
         """Get duration of a WAV audio file."""
-        import wave
-        
         try:
             with wave.open(str(audio_path), "rb") as wav_file:
                 frames = wav_file.getnframes()
@@ -205,6 +364,16 @@ class TTSGenerator:
         self.provider_name = provider or self.config.tts.provider
         self.provider = self._get_provider(self.provider_name)
 
+    def __enter__(self) -> "TTSGenerator":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Release the provider's connections, even if synthesis failed."""
+        self.provider.close()
+
     def _get_output_extension(self) -> str:
         """Get the output file extension for the current provider."""
         if self.provider_name == "local":
@@ -247,9 +416,13 @@ class TTSGenerator:
         self,
         script: Script,
         output_dir: Path | str | None = None,
+        cancel: threading.Event | None = None,
     ) -> list[tuple[int, Path, float]]:
         """Generate audio for all sections in a script.
 
+        Setting `cancel` stops sections that haven't started yet and raises
+        CancelledError.
+
         Returns list of tuples: (section_id, audio_path, duration_seconds).
         """
         if output_dir is None:
@@ -259,9 +432,33 @@ class TTSGenerator:
         else:
             output_dir = ensure_dir(Path(output_dir))
 
+        sections = script.sections
+        if not sections:
+            return []
+
+        def synthesize(section: ScriptSection) -> tuple[Path, float]:
+            _raise_if_cancelled(cancel)
+            return self.generate_for_section(section, output_dir)
+
+        if self.provider.supports_batching:
+            # Fewer, larger requests; the provider splits audio back per section
+            ext = self._get_output_extension()
+            paths = [output_dir / f"section_{s.section_id:03d}{ext}" for s in sections]
+            durations = self.provider.synthesize_batched(
+                [s.content for s in sections], paths, cancel
+            )
+            outputs = list(zip(paths, durations))
+        elif self.provider_name == "local":
+            # pyttsx3 engines are not thread-safe, synthesize one section at a time
+            outputs = [synthesize(section) for section in sections]
+        else:
+            # Provider calls are network-bound, so sections can be synthesized concurrently
+            self.provider.connect()
+            with ThreadPoolExecutor(max_workers=min(MAX_TTS_WORKERS, len(sections))) as executor:
+                outputs = list(executor.map(synthesize, sections))
+
         results = []
-        for section in script.sections:
-            audio_path, duration = self.generate_for_section(section, output_dir)
+        for section, (audio_path, duration) in zip(sections, outputs):
             results.append((section.section_id, audio_path, duration))
             # Update section with actual duration
             section.estimated_duration_sec = duration
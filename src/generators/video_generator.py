@@ -1,20 +1,91 @@
 """Video generator for combining slides and audio."""
 
+import os
+import tempfile
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
-from moviepy import (
-    AudioFileClip,
-    CompositeVideoClip,
-    ImageClip,
-    concatenate_audioclips,
-    concatenate_videoclips,
-    vfx,
-)
-
 from src.config import Settings, settings
 from src.models.presentation import Presentation, SyncData
+from src.utils.ffmpeg import (
+    available_filters,
+    can_encode,
+    can_run_filter,
+    concat_entry,
+    probe_duration,
+    run_ffmpeg,
+)
 from src.utils.helpers import ensure_dir, sanitize_filename
 
+# x264 preset names mapped to the closest NVENC presets (p1 fastest, p7 slowest)
+NVENC_PRESETS = {
+    "ultrafast": "p1",
+    "superfast": "p2",
+    "veryfast": "p3",
+    "faster": "p3",
+    "fast": "p4",
+    "medium": "p4",
+    "slow": "p5",
+    "slower": "p6",
+    "veryslow": "p7",
+    "placebo": "p7",
+}
+
+
+@dataclass(slots=True, frozen=True)
+class HWEncoder:
+    """A hardware H.264 encoder and the ffmpeg arguments it needs."""
+
+    codec: str
+    uses_preset: bool = False  # Whether the encoder takes -preset
+    params: tuple[str, ...] = ()
+    device_args: tuple[str, ...] = ()  # Global options opening the device
+    upload_filter: str | None = None  # Filter moving frames into device memory
+
+    def is_usable(self) -> bool:
+        """Check whether this encoder works on the current machine."""
+        return can_encode(self.codec, self.device_args, self.upload_filter)
+
+
+# Hardware encoders keyed by `video.hwaccel` name, in order of preference
+HW_ENCODERS = {
+    "nvenc": HWEncoder("h264_nvenc", uses_preset=True, params=("-rc", "vbr")),
+    "videotoolbox": HWEncoder("h264_videotoolbox"),
+    "vaapi": HWEncoder(
+        "h264_vaapi",
+        device_args=("-vaapi_device", "/dev/dri/renderD128"),
+        upload_filter="format=nv12,hwupload",
+    ),
+}
+
+
+@lru_cache(maxsize=1)
+def detect_hw_encoder() -> str | None:
+    """Find the preferred hardware H.264 encoder on this machine, probed once per process."""
+    for name, encoder in HW_ENCODERS.items():
+        if encoder.is_usable():
+            return name
+    return None
+
+
+# Global options creating the OpenCL device that GPU crossfades are blended on
+OPENCL_DEVICE_ARGS = ("-init_hw_device", "opencl=gpu", "-filter_hw_device", "gpu")
+
+
+@lru_cache(maxsize=1)
+def gpu_xfade_available() -> bool:
+    """Check whether crossfades can be blended on the GPU with xfade_opencl."""
+    if "xfade_opencl" not in available_filters():
+        return False
+    return can_run_filter(
+        "color=black:s=256x256:d=1,format=yuv420p,hwupload[a];"
+        "color=white:s=256x256:d=1,format=yuv420p,hwupload[b];"
+        "[a][b]xfade_opencl=transition=fade:duration=0.5:offset=0.25,"
+        "hwdownload,format=yuv420p",
+        OPENCL_DEVICE_ARGS,
+    )
+
 
 class VideoGenerator:
     """Generator for creating videos from slides and audio."""
@@ -22,6 +93,221 @@ class VideoGenerator:
     def __init__(self, config: Settings | None = None):
         self.config = config or settings()
         self.video_config = self.config.video
+        self._codec_args = self._select_encoder()
+        # With NVENC the GPU is already in use, so blend crossfades there as well
+        self._gpu_xfade = self._codec_args["codec"] == "h264_nvenc" and gpu_xfade_available()
+
+    def _select_encoder(self) -> dict:
+        """Choose encoder arguments, preferring a hardware encoder when one is enabled."""
+        hwaccel = self.video_config.hwaccel
+        preset = self.video_config.preset
+        if hwaccel == "auto":
+            # "auto" only swaps out the default H.264 software encoder
+            hwaccel = detect_hw_encoder() if self.video_config.codec == "libx264" else None
+        elif hwaccel == "none":
+            hwaccel = None
+        elif not HW_ENCODERS[hwaccel].is_usable():
+            raise RuntimeError(
+                f"{hwaccel} 하드웨어 인코더를 사용할 수 없습니다. GPU 드라이버를 확인해주세요."
+            )
+
+        if hwaccel is not None:
+            encoder = HW_ENCODERS[hwaccel]
+            return {
+                "codec": encoder.codec,
+                "preset": NVENC_PRESETS.get(preset, preset) if encoder.uses_preset else None,
+                "ffmpeg_params": list(encoder.params),
+                "device_args": list(encoder.device_args),
+                "upload_filter": encoder.upload_filter,
+            }
+        if self.video_config.codec == "libx264":
+            # Slides are static images; x264 has a tuning preset for exactly that
+            return {
+                "codec": "libx264",
+                "preset": preset,
+                "ffmpeg_params": ["-tune", "stillimage"],
+            }
+        return {"codec": self.video_config.codec, "preset": preset}
+
+    def _video_output_args(self) -> list[str]:
+        """Build ffmpeg output arguments for the selected video encoder."""
+        args = ["-c:v", self._codec_args["codec"]]
+        if self._codec_args["preset"]:
+            args += ["-preset", self._codec_args["preset"]]
+        args += [
+            *self._codec_args.get("ffmpeg_params", []),
+            "-b:v",
+            self.video_config.bitrate,
+            "-threads",
+            str(self.video_config.threads or os.cpu_count() or 1),
+        ]
+        if not self._codec_args.get("upload_filter"):
+            # Device encoders get their pixel format from the upload filter
+            args += ["-pix_fmt", "yuv420p"]
+        return [*args, "-r", str(self.video_config.fps)]
+
+    @staticmethod
+    def _slide_image(presentation: Presentation, slide_index: int) -> Path:
+        """Get a slide's image path, failing if it hasn't been exported."""
+        image_path = presentation.slides[slide_index].image_path
+        if image_path is None:
+            raise ValueError(f"Slide {slide_index} has no image path")
+        return image_path
+
+    def _concat_audio(
+        self, sync_data: SyncData, tmp: Path
+    ) -> tuple[list[str | Path], float] | None:
+        """Get ffmpeg input arguments that play the section audio back to back.
+
+        Each file is cut at its slide's duration. Files sharing a format are read
+        straight through the concat demuxer by the final encode; mixed formats are
+        first decoded into one file. Also returns the time the audio should start
+        at, which is the start of the first slide with audio.
+        """
+        voiced = [
+            item for item in sync_data.sync_items if item.audio_file and item.audio_file.exists()
+        ]
+        if not voiced:
+            return None
+        clips = [(item.audio_file, item.duration) for item in voiced]
+        start_time = voiced[0].start_time
+
+        if len({path.suffix.lower() for path, _ in clips}) == 1:
+            lines = []
+            for path, duration in clips:
+                lines += [concat_entry(path), f"outpoint {duration:.3f}"]
+            list_path = tmp / "audio.txt"
+            list_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+            return ["-f", "concat", "-safe", "0", "-i", list_path], start_time
+
+        # The concat demuxer can't mix codecs, so decode through the concat filter
+        inputs: list[str | Path] = []
+        for path, duration in clips:
+            inputs += ["-t", f"{duration:.3f}", "-i", path]
+        audio_path = tmp / "audio.mka"
+        run_ffmpeg(
+            *inputs,
+            "-filter_complex",
+            f"concat=n={len(clips)}:v=0:a=1",
+            "-c:a",
+            "pcm_s16le",
+            audio_path,
+        )
+        return ["-i", audio_path], start_time
+
+    def _encode(
+        self,
+        inputs: list[str | Path],
+        video_options: list[str | Path],
+        audio: tuple[list[str | Path], float] | None,
+        duration: float,
+        output_path: Path,
+    ) -> None:
+        """Run the final encode of the video inputs, muxing in the audio track if any.
+
+        `audio` is the audio input arguments and the time the audio starts at.
+        """
+        audio_input: list[str | Path] = []
+        audio_options: list[str | Path] = []
+        if audio is not None:
+            audio_input, start_time = audio
+            if "-map" in video_options:
+                # The audio input comes right after the video inputs
+                audio_options += ["-map", f"{inputs.count('-i')}:a"]
+            if start_time:
+                audio_options += ["-af", f"adelay=delays={round(start_time * 1000)}:all=1"]
+
+        run_ffmpeg(
+            *self._codec_args.get("device_args", []),
+            *inputs,
+            *audio_input,
+            *video_options,
+            *audio_options,
+            *self._video_output_args(),
+            "-c:a",
+            self.video_config.audio_codec,
+            "-t",
+            f"{duration:.3f}",
+            output_path,
+        )
+
+    def _concat_demuxer_inputs(self, slides: list[tuple[Path, float]], tmp: Path) -> list:
+        """Write a concat demuxer list showing each slide for its duration."""
+        lines = []
+        for image_path, duration in slides:
+            lines += [concat_entry(image_path), f"duration {duration:.3f}"]
+        # The concat demuxer ignores the last duration unless the file is repeated
+        lines.append(concat_entry(slides[-1][0]))
+
+        list_path = tmp / "slides.txt"
+        list_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        return ["-f", "concat", "-safe", "0", "-i", list_path]
+
+    def _needs_scaling(self, image_paths: list[Path]) -> bool:
+        """Check whether any slide image differs from the video resolution.
+
+        Slides are normally exported at the video size, so the scaler can be skipped.
+        Only image headers are read.
+        """
+        from PIL import Image
+
+        size = (self.video_config.width, self.video_config.height)
+        for image_path in set(image_paths):
+            with Image.open(image_path) as img:
+                if img.size != size:
+                    return True
+        return False
+
+    def _filter_options(self, image_paths: list[Path]) -> list[str]:
+        """Get -vf options resizing slides and uploading them to the encoder, if needed."""
+        filters = []
+        if self._needs_scaling(image_paths):
+            filters.append(f"scale={self.video_config.width}:{self.video_config.height}")
+        if self._codec_args.get("upload_filter"):
+            filters.append(self._codec_args["upload_filter"])
+        return ["-vf", ",".join(filters)] if filters else []
+
+    def _xfade_filter(self, durations: list[float], transition: float, scale: bool) -> str:
+        """Build a filter graph that crossfades between single-frame slide inputs.
+
+        Each slide's frame is scaled at most once and then repeated, and every fade
+        starts where the next slide's narration starts, so the video keeps the sync
+        timing. On the GPU path, the repeated frames are uploaded to the OpenCL
+        device and the fades are blended there.
+        """
+        scale_filter = (
+            f"scale={self.video_config.width}:{self.video_config.height}," if scale else ""
+        )
+        upload_filter = ",hwupload" if self._gpu_xfade else ""
+        xfade = "xfade_opencl" if self._gpu_xfade else "xfade"
+        last = len(durations) - 1
+        filters = []
+        for i, duration in enumerate(durations):
+            # Slides before the last are held for the fade into the next one
+            length = duration + (transition if i < last else 0)
+            filters.append(
+                f"[{i}:v]{scale_filter}setsar=1,format=yuv420p,"
+                f"tpad=stop_mode=clone:stop_duration={length:.3f},"
+                f"trim=duration={length:.3f}{upload_filter}[s{i}]"
+            )
+
+        previous = "[s0]"
+        offset = 0.0
+        for i in range(1, len(durations)):
+            offset += durations[i - 1]
+            label = f"[x{i}]"
+            filters.append(
+                f"{previous}[s{i}]{xfade}=transition=fade:duration={transition:.3f}:"
+                f"offset={offset:.3f}{label}"
+            )
+            previous = label
+
+        if self._gpu_xfade:
+            # NVENC reads system memory frames; OpenCL frames can't be passed to it
+            output_filter = "hwdownload,format=yuv420p"
+        else:
+            output_filter = self._codec_args.get("upload_filter") or "null"
+        return ";".join(filters) + f";{previous}{output_filter}[vout]"
 
     def generate(
         self,
@@ -46,60 +332,21 @@ class VideoGenerator:
             output_path = Path(output_path)
             ensure_dir(output_path.parent)
 
-        # Create video clips for each slide
-        video_clips = []
-        audio_clips = []
-
-        for sync_item in sync_data.sync_items:
-            slide = presentation.slides[sync_item.slide_index]
-            duration = sync_item.duration
-
-            if slide.image_path is None:
-                raise ValueError(f"Slide {sync_item.slide_index} has no image path")
-
-            # Create image clip
-            img_clip = (
-                ImageClip(str(slide.image_path))
-                .with_duration(duration)
-                .resized((self.video_config.width, self.video_config.height))
+        slides = [
+            (self._slide_image(presentation, item.slide_index), item.duration)
+            for item in sync_data.sync_items
+        ]
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp = Path(tmpdir)
+            self._encode(
+                self._concat_demuxer_inputs(slides, tmp),
+                self._filter_options([path for path, _ in slides]),
+                self._concat_audio(sync_data, tmp),
+                sum(duration for _, duration in slides),
+                output_path,
             )
 
-            video_clips.append(img_clip)
-
-            # Add audio if available
-            if sync_item.audio_file and sync_item.audio_file.exists():
-                audio_clip = AudioFileClip(str(sync_item.audio_file))
-                # Ensure audio matches the expected duration
-                if audio_clip.duration > duration:
-                    audio_clip = audio_clip.subclipped(0, duration)
-                audio_clips.append(audio_clip)
-
-        # Concatenate video clips
-        final_video = concatenate_videoclips(video_clips, method="compose")
-
-        # Add audio if available
-        if audio_clips:
-            final_audio = concatenate_audioclips(audio_clips)
-            final_video = final_video.with_audio(final_audio)
-
-        # Write video file
-        final_video.write_videofile(
-            str(output_path),
-            fps=self.video_config.fps,
-            codec=self.video_config.codec,
-            audio_codec=self.video_config.audio_codec,
-            bitrate=self.video_config.bitrate,
-            preset="medium",
-            threads=4,
-        )
-
-        # Clean up
-        final_video.close()
-        for clip in video_clips:
-            clip.close()
-        for clip in audio_clips:
-            clip.close()
-
         return output_path
 
     def generate_with_transitions(
@@ -126,68 +373,33 @@ class VideoGenerator:
             ensure_dir(output_path.parent)
 
         transition_duration = self.video_config.transition_duration
-        video_clips = []
-        audio_clips = []
-
-        for i, sync_item in enumerate(sync_data.sync_items):
-            slide = presentation.slides[sync_item.slide_index]
-            duration = sync_item.duration
-
-            if slide.image_path is None:
-                raise ValueError(f"Slide {sync_item.slide_index} has no image path")
-
-            # Create image clip
-            img_clip = (
-                ImageClip(str(slide.image_path))
-                .with_duration(duration)
-                .resized((self.video_config.width, self.video_config.height))
+        durations = [item.duration for item in sync_data.sync_items]
+        if len(durations) < 2 or transition_duration <= 0:
+            return self.generate(presentation, sync_data, output_path)
+
+        image_paths = [
+            self._slide_image(presentation, item.slide_index) for item in sync_data.sync_items
+        ]
+        inputs: list[str | Path] = list(OPENCL_DEVICE_ARGS) if self._gpu_xfade else []
+        for image_path in image_paths:
+            inputs += ["-framerate", str(self.video_config.fps), "-i", image_path]
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self._encode(
+                inputs,
+                [
+                    "-filter_complex",
+                    self._xfade_filter(
+                        durations, transition_duration, self._needs_scaling(image_paths)
+                    ),
+                    "-map",
+                    "[vout]",
+                ],
+                self._concat_audio(sync_data, Path(tmpdir)),
+                sum(durations),
+                output_path,
             )
 
-            # Add fade in/out for transitions (except first and last)
-            if i > 0:
-                img_clip = img_clip.with_effects([vfx.CrossFadeIn(transition_duration)])
-            if i < len(sync_data.sync_items) - 1:
-                img_clip = img_clip.with_effects([vfx.CrossFadeOut(transition_duration)])
-
-            video_clips.append(img_clip)
-
-            # Add audio if available
-            if sync_item.audio_file and sync_item.audio_file.exists():
-                audio_clip = AudioFileClip(str(sync_item.audio_file))
-                if audio_clip.duration > duration:
-                    audio_clip = audio_clip.subclipped(0, duration)
-                audio_clips.append(audio_clip)
-
-        # Concatenate with crossfade
-        final_video = concatenate_videoclips(
-            video_clips,
-            method="compose",
-            padding=-transition_duration,
-        )
-
-        # Add audio
-        if audio_clips:
-            final_audio = concatenate_audioclips(audio_clips)
-            final_video = final_video.with_audio(final_audio)
-
-        # Write video file
-        final_video.write_videofile(
-            str(output_path),
-            fps=self.video_config.fps,
-            codec=self.video_config.codec,
-            audio_codec=self.video_config.audio_codec,
-            bitrate=self.video_config.bitrate,
-            preset="medium",
-            threads=4,
-        )
-
-        # Clean up
-        final_video.close()
-        for clip in video_clips:
-            clip.close()
-        for clip in audio_clips:
-            clip.close()
-
         return output_path
 
     def generate_from_single_audio(
@@ -215,44 +427,20 @@ class VideoGenerator:
             output_path = Path(output_path)
             ensure_dir(output_path.parent)
 
-        # Load audio to get duration
-        audio_clip = AudioFileClip(str(audio_path))
-        total_duration = audio_clip.duration
-        num_slides = len(presentation.slides)
-        duration_per_slide = total_duration / num_slides
-
-        # Create video clips
-        video_clips = []
-        for slide in presentation.slides:
-            if slide.image_path is None:
-                raise ValueError(f"Slide {slide.slide_index} has no image path")
-
-            img_clip = (
-                ImageClip(str(slide.image_path))
-                .with_duration(duration_per_slide)
-                .resized((self.video_config.width, self.video_config.height))
+        total_duration = probe_duration(audio_path)
+        duration_per_slide = total_duration / len(presentation.slides)
+        slides = [
+            (self._slide_image(presentation, slide.slide_index), duration_per_slide)
+            for slide in presentation.slides
+        ]
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self._encode(
+                self._concat_demuxer_inputs(slides, Path(tmpdir)),
+                self._filter_options([path for path, _ in slides]),
+                (["-i", audio_path], 0.0),
+                total_duration,
+                output_path,
             )
-            video_clips.append(img_clip)
-
-        # Concatenate and add audio
-        final_video = concatenate_videoclips(video_clips, method="compose")
-        final_video = final_video.with_audio(audio_clip)
-
-        # Write video
-        final_video.write_videofile(
-            str(output_path),
-            fps=self.video_config.fps,
-            codec=self.video_config.codec,
-            audio_codec=self.video_config.audio_codec,
-            bitrate=self.video_config.bitrate,
-            preset="medium",
-            threads=4,
-        )
-
-        # Clean up
-        final_video.close()
-        audio_clip.close()
-        for clip in video_clips:
-            clip.close()
 
         return output_path
@@ -1,12 +1,21 @@
 """Main CLI interface and pipeline orchestrator."""
 
-import json
+import threading
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+from contextlib import closing
 from pathlib import Path
 
 import click
 from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.panel import Panel
+from rich.progress import (
+    BarColumn,
+    DownloadColumn,
+    Progress,
+    SpinnerColumn,
+    TextColumn,
+    TransferSpeedColumn,
+)
 
 from src.config import init_settings, settings
 from src.generators.ppt_generator import PPTGenerator
@@ -16,6 +25,7 @@ from src.generators.video_generator import VideoGenerator
 from src.models.script import Script, ScriptInput
 from src.services.sync_service import SyncService
 from src.services.youtube_service import YouTubeService
+from src.utils.ffmpeg import probe_duration
 from src.utils.helpers import ensure_dir, sanitize_filename
 
 console = Console()
@@ -66,8 +76,7 @@ def script(ctx, topic, storyline, duration, tone, output):
         output_dir = ensure_dir(Path(settings().output.base_dir) / "scripts")
         output_path = output_dir / f"{sanitize_filename(topic)}.json"
 
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(result.model_dump(), f, ensure_ascii=False, indent=2)
+    output_path.write_text(result.model_dump_json(indent=2), encoding="utf-8")
 
     console.print(Panel(f"Script saved to: {output_path}", title="Success", style="green"))
     console.print(f"Total sections: {len(result.sections)}")
@@ -75,15 +84,14 @@ def script(ctx, topic, storyline, duration, tone, output):
 
 
 @cli.command()
-@click.option("--script", "-s", required=True, type=click.Path(exists=True), help="Path to script JSON")
+@click.option(
+    "--script", "-s", required=True, type=click.Path(exists=True), help="Path to script JSON"
+)
 @click.option("--output", "-o", type=click.Path(), help="Output PPTX file path")
 @click.pass_context
 def ppt(ctx, script, output):
     """Generate PowerPoint presentation from script."""
-    with open(script, encoding="utf-8") as f:
-        script_data = json.load(f)
-
-    script_obj = Script(**script_data)
+    script_obj = Script.model_validate_json(Path(script).read_bytes())
 
     with Progress(
         SpinnerColumn(),
@@ -96,21 +104,24 @@ def ppt(ctx, script, output):
         presentation = generator.generate(script_obj, output)
         progress.update(task, completed=True)
 
-    console.print(Panel(f"Presentation saved to: {presentation.file_path}", title="Success", style="green"))
+    console.print(
+        Panel(f"Presentation saved to: {presentation.file_path}", title="Success", style="green")
+    )
     console.print(f"Total slides: {len(presentation.slides)}")
 
 
 @cli.command()
-@click.option("--script", "-s", required=True, type=click.Path(exists=True), help="Path to script JSON")
+@click.option(
+    "--script", "-s", required=True, type=click.Path(exists=True), help="Path to script JSON"
+)
 @click.option("--output-dir", "-o", type=click.Path(), help="Output directory for audio files")
-@click.option("--provider", "-p", type=click.Choice(["elevenlabs", "google", "openai"]), help="TTS provider")
+@click.option(
+    "--provider", "-p", type=click.Choice(["elevenlabs", "google", "openai"]), help="TTS provider"
+)
 @click.pass_context
 def tts(ctx, script, output_dir, provider):
     """Generate TTS audio from script."""
-    with open(script, encoding="utf-8") as f:
-        script_data = json.load(f)
-
-    script_obj = Script(**script_data)
+    script_obj = Script.model_validate_json(Path(script).read_bytes())
 
     with Progress(
         SpinnerColumn(),
@@ -119,8 +130,8 @@ def tts(ctx, script, output_dir, provider):
     ) as progress:
         task = progress.add_task("Generating audio...", total=None)
 
-        generator = TTSGenerator(config=ctx.obj["settings"], provider=provider)
-        results = generator.generate_for_script(script_obj, output_dir)
+        with TTSGenerator(config=ctx.obj["settings"], provider=provider) as generator:
+            results = generator.generate_for_script(script_obj, output_dir)
         progress.update(task, completed=True)
 
     total_duration = sum(duration for _, _, duration in results)
@@ -132,9 +143,21 @@ def tts(ctx, script, output_dir, provider):
 
 
 @cli.command()
-@click.option("--script", "-s", required=True, type=click.Path(exists=True), help="Path to script JSON")
-@click.option("--ppt", "-p", type=click.Path(exists=True), help="Path to PPTX file (optional, will generate if not provided)")
-@click.option("--audio-dir", "-a", type=click.Path(exists=True), help="Directory with audio files (optional, will generate if not provided)")
+@click.option(
+    "--script", "-s", required=True, type=click.Path(exists=True), help="Path to script JSON"
+)
+@click.option(
+    "--ppt",
+    "-p",
+    type=click.Path(exists=True),
+    help="Path to PPTX file (optional, will generate if not provided)",
+)
+@click.option(
+    "--audio-dir",
+    "-a",
+    type=click.Path(exists=True),
+    help="Directory with audio files (optional, will generate if not provided)",
+)
 @click.option("--output", "-o", type=click.Path(), help="Output video file path")
 @click.option("--transitions/--no-transitions", default=True, help="Enable fade transitions")
 @click.pass_context
@@ -142,18 +165,19 @@ def video(ctx, script, ppt, audio_dir, output, transitions):
     """Generate video from script, presentation, and audio."""
     config = ctx.obj["settings"]
 
-    with open(script, encoding="utf-8") as f:
-        script_data = json.load(f)
-    script_obj = Script(**script_data)
+    script_obj = Script.model_validate_json(Path(script).read_bytes())
 
     with Progress(
         SpinnerColumn(),
         TextColumn("[progress.description]{task.description}"),
         console=console,
     ) as progress:
+        ppt_generator = PPTGenerator(config=config)
+
         # Generate or load presentation
         if ppt:
             from pptx import Presentation as PPTXPresentation
+
             from src.models.presentation import Presentation, Slide
 
             pptx = PPTXPresentation(ppt)
@@ -168,55 +192,42 @@ def video(ctx, script, ppt, audio_dir, output, transitions):
             presentation = Presentation(title=script_obj.title, slides=slides, file_path=Path(ppt))
         else:
             task = progress.add_task("Generating presentation...", total=None)
-            ppt_generator = PPTGenerator(config=config)
             presentation = ppt_generator.generate(script_obj)
             progress.update(task, completed=True)
 
         # Export slides as images
-        task = progress.add_task("Exporting slides as images...", total=None)
-        ppt_generator = PPTGenerator(config=config)
-        image_paths = ppt_generator.export_slides_as_images(presentation)
-        progress.update(task, completed=True)
+        task = progress.add_task("Exporting slides as images...", total=len(presentation.slides))
+        for _ in ppt_generator.iter_export_slides_as_images(presentation):
+            progress.advance(task)
 
         # Generate or load audio
         if audio_dir:
             audio_dir = Path(audio_dir)
-            audio_results = []
-            
-            # Need a way to measure duration if loading existing files
-            try:
-                from mutagen.mp3 import MP3
-                from mutagen.wave import WAVE
-            except ImportError:
-                console.print("[yellow]Warning: mutagen not installed. Audio duration estimation might be inaccurate.[/yellow]")
 
+            # Try mp3 then wav for each section
+            audio_files = []
             for section in script_obj.sections:
-                # Try mp3 then wav
-                audio_path_mp3 = audio_dir / f"section_{section.section_id:03d}.mp3"
-                audio_path_wav = audio_dir / f"section_{section.section_id:03d}.wav"
-                
-                audio_path = None
-                duration = section.estimated_duration_sec  # Default fallback
-                
-                if audio_path_mp3.exists():
-                    audio_path = audio_path_mp3
-                    try:
-                        duration = MP3(str(audio_path)).info.length
-                    except:
-                        pass
-                elif audio_path_wav.exists():
-                    audio_path = audio_path_wav
-                    try:
-                        duration = WAVE(str(audio_path)).info.length
-                    except:
-                        pass
-                
-                if audio_path:
-                    audio_results.append((section.section_id, audio_path, duration))
+                for suffix in (".mp3", ".wav"):
+                    audio_path = audio_dir / f"section_{section.section_id:03d}{suffix}"
+                    if audio_path.exists():
+                        audio_files.append((section, audio_path))
+                        break
+
+            def measure(item: tuple) -> tuple[int, Path, float]:
+                section, audio_path = item
+                try:
+                    duration = probe_duration(audio_path)
+                except RuntimeError:
+                    duration = section.estimated_duration_sec  # Default fallback
+                return section.section_id, audio_path, duration
+
+            # Each probe is a short ffmpeg run, so measure the files concurrently
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                audio_results = list(executor.map(measure, audio_files))
         else:
             task = progress.add_task("Generating audio...", total=None)
-            tts_generator = TTSGenerator(config=config)
-            audio_results = tts_generator.generate_for_script(script_obj)
+            with TTSGenerator(config=config) as tts_generator:
+                audio_results = tts_generator.generate_for_script(script_obj)
             progress.update(task, completed=True)
 
         # Create sync data
@@ -239,7 +250,9 @@ def video(ctx, script, ppt, audio_dir, output, transitions):
 
 
 @cli.command()
-@click.option("--video", "-v", required=True, type=click.Path(exists=True), help="Path to video file")
+@click.option(
+    "--video", "-v", required=True, type=click.Path(exists=True), help="Path to video file"
+)
 @click.option("--title", "-t", required=True, help="Video title")
 @click.option("--description", "-d", help="Video description")
 @click.option("--tags", help="Comma-separated tags")
@@ -253,12 +266,15 @@ def upload(ctx, video, title, description, tags, privacy, thumbnail):
     with Progress(
         SpinnerColumn(),
         TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        DownloadColumn(),
+        TransferSpeedColumn(),
         console=console,
     ) as progress:
         task = progress.add_task("Uploading to YouTube...", total=None)
 
         service = YouTubeService(config=ctx.obj["settings"])
-        video_id = service.upload(
+        chunks = service.iter_upload(
             video_path=video,
             title=title,
             description=description or "",
@@ -266,7 +282,13 @@ def upload(ctx, video, title, description, tags, privacy, thumbnail):
             privacy_status=privacy,
             thumbnail_path=thumbnail,
         )
-        progress.update(task, completed=True)
+        while True:
+            try:
+                uploaded, total = next(chunks)
+            except StopIteration as done:
+                video_id = done.value
+                break
+            progress.update(task, completed=uploaded, total=total)
 
     video_url = service.get_video_url(video_id)
     console.print(Panel(f"Video uploaded!\nURL: {video_url}", title="Success", style="green"))
@@ -284,7 +306,11 @@ def generate(ctx, topic, storyline, duration, tone, upload, privacy):
     """Run the complete content generation pipeline."""
     config = ctx.obj["settings"]
 
-    console.print(Panel(f"Starting content generation pipeline\nTopic: {topic}", title="Pipeline", style="blue"))
+    console.print(
+        Panel(
+            f"Starting content generation pipeline\nTopic: {topic}", title="Pipeline", style="blue"
+        )
+    )
 
     with Progress(
         SpinnerColumn(),
@@ -311,16 +337,42 @@ def generate(ctx, topic, storyline, duration, tone, upload, privacy):
         progress.update(task, completed=True)
         console.print(f"  Created {len(presentation.slides)} slides")
 
-        # Step 3: Export slides as images
-        task = progress.add_task("Step 3/5: Exporting slide images...", total=None)
-        image_paths = ppt_generator.export_slides_as_images(presentation)
-        progress.update(task, completed=True)
+        # Steps 3-4: Slide images and TTS audio don't depend on each other, so the
+        # images are exported in the background while audio is generated
+        image_task = progress.add_task(
+            "Step 3/5: Exporting slide images...", total=len(presentation.slides)
+        )
+        audio_task = progress.add_task("Step 4/5: Generating audio...", total=None)
 
-        # Step 4: Generate TTS audio
-        task = progress.add_task("Step 4/5: Generating audio...", total=None)
-        tts_generator = TTSGenerator(config=config)
-        audio_results = tts_generator.generate_for_script(script_obj)
-        progress.update(task, completed=True)
+        # Set when either step fails, so the other stops instead of running to the end
+        failed = threading.Event()
+
+        def export_images() -> None:
+            try:
+                images = ppt_generator.iter_export_slides_as_images(presentation)
+                with closing(images):
+                    for _ in images:
+                        if failed.is_set():
+                            return
+                        progress.advance(image_task)
+            except BaseException:
+                failed.set()
+                raise
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            images_done = executor.submit(export_images)
+            # TTS stays on the main thread; some local engines require it
+            try:
+                with TTSGenerator(config=config) as tts_generator:
+                    audio_results = tts_generator.generate_for_script(script_obj, cancel=failed)
+            except CancelledError:
+                images_done.result()  # Raises the export error that cancelled TTS
+                raise
+            except BaseException:
+                failed.set()
+                raise
+            progress.update(audio_task, completed=True)
+            images_done.result()
         total_audio_duration = sum(d for _, _, d in audio_results)
         console.print(f"  Total audio duration: {total_audio_duration:.1f}s")
 
@@ -348,7 +400,9 @@ def generate(ctx, topic, storyline, duration, tone, upload, privacy):
             privacy_status=privacy,
         )
         video_url = service.get_video_url(video_id)
-        console.print(Panel(f"Uploaded to YouTube!\nURL: {video_url}", title="YouTube", style="green"))
+        console.print(
+            Panel(f"Uploaded to YouTube!\nURL: {video_url}", title="YouTube", style="green")
+        )
 
 
 if __name__ == "__main__":
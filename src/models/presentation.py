@@ -1,18 +1,23 @@
 """Presentation and synchronization data models."""
 
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from functools import cached_property
 from pathlib import Path
 
+import numpy as np
 from pydantic import BaseModel, Field
 
 
-class Slide(BaseModel):
+@dataclass(slots=True)
+class Slide:
     """A single slide in the presentation."""
 
-    slide_index: int = Field(..., description="Zero-based slide index")
-    title: str = Field(..., description="Slide title")
-    content: list[str] = Field(default_factory=list, description="Bullet points or content")
-    notes: str = Field(default="", description="Speaker notes (script text)")
-    image_path: Path | None = Field(default=None, description="Path to slide image for video")
+    slide_index: int  # Zero-based slide index
+    title: str
+    content: list[str] = field(default_factory=list)  # Bullet points or content
+    notes: str = ""  # Speaker notes (script text)
+    image_path: Path | None = None  # Path to slide image for video
 
 
 class Presentation(BaseModel):
@@ -27,14 +32,15 @@ class Presentation(BaseModel):
         return len(self.slides)
 
 
-class SyncInfo(BaseModel):
+@dataclass(slots=True)
+class SyncInfo:
     """Synchronization information for a slide."""
 
-    slide_index: int = Field(..., description="Zero-based slide index")
-    section_id: int = Field(..., description="Corresponding script section ID")
-    start_time: float = Field(..., description="Start time in seconds")
-    end_time: float = Field(..., description="End time in seconds")
-    audio_file: Path | None = Field(default=None, description="Path to audio file for this section")
+    slide_index: int  # Zero-based slide index
+    section_id: int  # Corresponding script section ID
+    start_time: float  # Seconds
+    end_time: float  # Seconds
+    audio_file: Path | None = None  # Audio file for this section
 
     @property
     def duration(self) -> float:
@@ -42,23 +48,112 @@ class SyncInfo(BaseModel):
         return self.end_time - self.start_time
 
 
+@dataclass(slots=True)
+class _Timeline:
+    """Sync item fields as arrays, with the items ordered by start time for lookups."""
+
+    items: list[SyncInfo]  # The list these were built from
+    size: int  # Its length when built
+    starts: np.ndarray
+    ends: np.ndarray
+    section_ids: np.ndarray
+    slide_indices: np.ndarray
+    order: list[int]  # Item indices by start time
+    sorted_starts: list[float]
+    ends_list: list[float]
+    disjoint: bool  # No two items overlap
+    by_slide: dict[int, SyncInfo]  # First item for each slide
+
+
 class SyncData(BaseModel):
     """Complete synchronization data for the video."""
 
-    sync_items: list[SyncInfo] = Field(
-        default_factory=list, description="List of sync information"
-    )
+    sync_items: list[SyncInfo] = Field(default_factory=list, description="List of sync information")
     total_duration: float = Field(default=0.0, description="Total video duration")
 
+    @cached_property
+    def _timeline(self) -> _Timeline:
+        """Item fields as arrays, and items by slide, built once and kept until changed."""
+        columns = np.array(
+            [
+                (item.start_time, item.end_time, item.section_id, item.slide_index)
+                for item in self.sync_items
+            ],
+            dtype=float,
+        ).reshape(-1, 4)
+        starts, ends = columns[:, 0], columns[:, 1]
+        by_slide: dict[int, SyncInfo] = {}
+        for item in self.sync_items:
+            by_slide.setdefault(item.slide_index, item)
+        order = np.argsort(starts, kind="stable")
+        sorted_starts, sorted_ends = starts[order], ends[order]
+        return _Timeline(
+            items=self.sync_items,
+            size=len(self.sync_items),
+            starts=starts,
+            ends=ends,
+            # IDs are small integers, so the round trip through float is exact
+            section_ids=columns[:, 2].astype(np.int64),
+            slide_indices=columns[:, 3].astype(np.int64),
+            order=order.tolist(),
+            sorted_starts=sorted_starts.tolist(),
+            ends_list=ends.tolist(),
+            disjoint=bool(np.all(sorted_ends[:-1] <= sorted_starts[1:])),
+            by_slide=by_slide,
+        )
+
+    def _current_timeline(self) -> _Timeline:
+        """Get the timeline, rebuilt if sync_items was replaced or changed length."""
+        timeline = self._timeline
+        if timeline.items is not self.sync_items or timeline.size != len(self.sync_items):
+            self.mark_changed()
+            timeline = self._timeline
+        return timeline
+
+    def mark_changed(self) -> None:
+        """Rebuild the lookup arrays and index on next use; call after editing items in place."""
+        self.__dict__.pop("_timeline", None)
+
+    @property
+    def start_times(self) -> np.ndarray:
+        """Start time of each sync item, in seconds."""
+        return self._current_timeline().starts
+
+    @property
+    def end_times(self) -> np.ndarray:
+        """End time of each sync item, in seconds."""
+        return self._current_timeline().ends
+
+    @property
+    def section_ids(self) -> np.ndarray:
+        """Script section ID of each sync item."""
+        return self._current_timeline().section_ids
+
+    @property
+    def slide_indices(self) -> np.ndarray:
+        """Slide index of each sync item."""
+        return self._current_timeline().slide_indices
+
+    def item_at_time(self, time: float) -> SyncInfo | None:
+        """Get the first sync item playing at a time (start <= time < end)."""
+        timeline = self._current_timeline()
+        if timeline.disjoint:
+            # Without overlaps, the last item starting by `time` is the only candidate.
+            # bisect on a list beats a numpy call for a single value.
+            i = bisect_right(timeline.sorted_starts, time) - 1
+            if i < 0:
+                return None
+            i = timeline.order[i]
+            return self.sync_items[i] if time < timeline.ends_list[i] else None
+        hits = np.flatnonzero((timeline.starts <= time) & (time < timeline.ends))
+        return self.sync_items[hits[0]] if hits.size else None
+
     def calculate_total_duration(self) -> float:
         """Calculate total duration from sync items."""
         if self.sync_items:
-            self.total_duration = max(item.end_time for item in self.sync_items)
+            self.total_duration = float(self.end_times.max())
         return self.total_duration
 
     def get_sync_for_slide(self, slide_index: int) -> SyncInfo | None:
         """Get sync info for a specific slide."""
-        for item in self.sync_items:
-            if item.slide_index == slide_index:
-                return item
-        return None
+        return self._current_timeline().by_slide.get(slide_index)
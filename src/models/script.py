@@ -1,7 +1,13 @@
 """Script data models."""
 
+import math
+from dataclasses import dataclass, field
+from functools import cached_property
+
 from pydantic import BaseModel, Field
 
+from src.utils.helpers import estimate_speech_duration
+
 
 class ScriptInput(BaseModel):
     """Input for script generation."""
@@ -13,19 +19,31 @@ class ScriptInput(BaseModel):
     language: str = Field(default="ko", description="Language code")
 
 
-class ScriptSection(BaseModel):
+@dataclass(slots=True)
+class ScriptSection:
     """A section of the script corresponding to one slide."""
 
-    section_id: int = Field(..., description="Unique section identifier")
-    title: str = Field(..., description="Section title for the slide")
-    content: str = Field(..., description="Full narration text for this section")
-    key_points: list[str] = Field(
-        default_factory=list, description="Key bullet points for the slide"
-    )
-    slide_notes: str = Field(default="", description="Additional notes for slide design")
-    estimated_duration_sec: float = Field(
-        default=0.0, description="Estimated duration in seconds"
-    )
+    section_id: int  # Unique section identifier
+    title: str  # Section title for the slide
+    content: str  # Full narration text for this section
+    key_points: list[str] = field(default_factory=list)  # Key bullet points for the slide
+    slide_notes: str = ""  # Additional notes for slide design
+    # Estimated duration in seconds; NaN (not given) is estimated from the content
+    estimated_duration_sec: float = math.nan
+
+    def __post_init__(self) -> None:
+        """Estimate the duration from the content when it isn't given."""
+        if math.isnan(self.estimated_duration_sec):
+            self.estimated_duration_sec = estimate_speech_duration(self.content)
+
+
+@dataclass(slots=True)
+class _SectionIndex:
+    """Script sections by ID."""
+
+    sections: list[ScriptSection]  # The list this was built from
+    size: int  # Its length when built
+    by_id: dict[int, ScriptSection]  # First section with each ID
 
 
 class Script(BaseModel):
@@ -48,9 +66,22 @@ class Script(BaseModel):
         """Convert script to full narration text."""
         return "\n\n".join(section.content for section in self.sections)
 
+    @cached_property
+    def _section_index(self) -> _SectionIndex:
+        """Sections by ID, built on first use and kept until changed."""
+        by_id: dict[int, ScriptSection] = {}
+        for section in self.sections:
+            by_id.setdefault(section.section_id, section)
+        return _SectionIndex(sections=self.sections, size=len(self.sections), by_id=by_id)
+
+    def mark_changed(self) -> None:
+        """Rebuild the section index on next use; call after editing sections in place."""
+        self.__dict__.pop("_section_index", None)
+
     def get_section_by_id(self, section_id: int) -> ScriptSection | None:
         """Get a section by its ID."""
-        for section in self.sections:
-            if section.section_id == section_id:
-                return section
-        return None
+        index = self._section_index
+        if index.sections is not self.sections or index.size != len(self.sections):
+            self.mark_changed()
+            index = self._section_index
+        return index.by_id.get(section_id)
@@ -0,0 +1,65 @@
+"""On-disk cache of AI model responses."""
+
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Default cache location, one JSON file per response
+CACHE_DIR = Path.home() / ".cache" / "contents-autouploader" / "ai"
+
+
+def cache_key(*parts: str | int | float | None) -> str:
+    """Build a cache key from everything that determines a response."""
+    # JSON keeps part boundaries and types distinct, e.g. ("a|b", "c") vs ("a", "b|c")
+    encoded = json.dumps(parts, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Cache of response strings keyed by cache_key(), expiring after a TTL."""
+
+    def __init__(self, ttl_days: float = 30, directory: Path | None = None):
+        self.ttl_seconds = ttl_days * 86400
+        self.directory = directory or CACHE_DIR
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str) -> str | None:
+        """Get a cached response, or None if missing, expired or unreadable."""
+        try:
+            entry = json.loads(self._path(key).read_bytes())
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or time.time() - entry.get("ts", 0) > self.ttl_seconds:
+            return None
+        return entry.get("response")
+
+    def set(self, key: str, value: str) -> None:
+        """Store a response, replacing the file atomically.
+
+        Write errors (e.g. a full or read-only disk) are logged rather than raised,
+        since the response they would cache was produced successfully.
+        """
+        data = json.dumps({"response": value, "ts": time.time()}, ensure_ascii=False)
+        tmp_path = None
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp_path, self._path(key))
+        except BaseException as e:
+            if tmp_path is not None:
+                with contextlib.suppress(OSError):
+                    os.unlink(tmp_path)
+            if not isinstance(e, OSError):
+                raise
+            logger.warning("Could not cache AI response in %s: %s", self.directory, e)
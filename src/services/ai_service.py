@@ -1,114 +1,500 @@
 """AI service abstraction layer for Claude, OpenAI, and Ollama."""
 
+import asyncio
 import json
+import threading
+import time
 from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from typing import TypeVar
 
-import anthropic
-import openai
+import orjson
 
 from src.config import Settings, settings
+from src.services.ai_cache import ResponseCache, cache_key
+from src.utils.http import http2_available
+
+T = TypeVar("T")
+
+# Decodes the first JSON value in a string, ignoring whatever follows it
+_JSON_DECODER = json.JSONDecoder()
 
 
 def _parse_json_response(response: str) -> dict:
-    """Parse JSON content from a model response."""
+    """Parse JSON content from a model response.
+
+    Clean JSON is parsed directly. Otherwise the object starting at the first
+    "{" is decoded up to its closing brace, which skips code fences and any
+    text around the JSON in a single pass.
+    """
     try:
-        return json.loads(response)
-    except json.JSONDecodeError:
-        cleaned = response.strip()
-        if cleaned.startswith("```"):
-            cleaned = cleaned[3:].lstrip()
-            if cleaned.startswith("json"):
-                cleaned = cleaned[4:].lstrip()
-            if cleaned.endswith("```"):
-                cleaned = cleaned[:-3].rstrip()
+        return orjson.loads(response)
+    except ValueError:
+        pass
+
+    start = response.find("{")
+    if start != -1:
         try:
-            return json.loads(cleaned)
-        except json.JSONDecodeError:
-            start = response.find("{")
-            end = response.rfind("}") + 1
-            if start != -1 and end > start:
-                return json.loads(response[start:end])
-            raise ValueError(f"Could not parse JSON from response: {response[:200]}...")
+            return _JSON_DECODER.raw_decode(response, start)[0]
+        except ValueError:
+            pass
+    raise ValueError(f"Could not parse JSON from response: {response[:200]}...")
+
+
+def _estimate_tokens(text: str) -> int:
+    """Estimate a text's token count on the high side (half its UTF-8 size)."""
+    return len(text.encode("utf-8")) // 2
+
+
+# Claude only caches prompt prefixes of at least this many tokens
+PROMPT_CACHE_MIN_TOKENS = 1024
+
+# Tool Claude is made to call in generate_structured; its input is the result
+STRUCTURED_TOOL_NAME = "respond"
+
+# How long Ollama keeps a prewarmed model loaded without requests
+OLLAMA_PREWARM_KEEP_ALIVE = "30m"
+
+# Seconds between Message Batches status checks, doubling up to the maximum
+BATCH_POLL_INITIAL_SEC = 5.0
+BATCH_POLL_MAX_SEC = 60.0
+
+# Message Batches limits: requests per batch and total request size
+MAX_BATCH_REQUESTS = 100_000
+MAX_BATCH_BYTES = 256 * 1024 * 1024
+
+# How long to wait for a batch before canceling it; unfinished batches expire after 24 hours
+BATCH_MAX_WAIT_SEC = 24 * 60 * 60
+
+
+def _chat_deltas(stream) -> Iterator[str]:
+    """Yield the text content of streamed chat completion chunks."""
+    with stream:
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
 
 
 class AIService(ABC):
     """Abstract base class for AI services."""
 
+    # Provider name, part of response cache keys
+    provider = ""
+    # On-disk response cache; subclasses enable it from config.ai
+    _cache: ResponseCache | None = None
+    # Worker threads for generate_json_many
+    _concurrency = 8
+    # Limits requests in flight across concurrent generate_json_many calls
+    _in_flight: threading.Semaphore | None = None
+
+    def _init_from_config(self, config: Settings) -> None:
+        """Set up the response cache and request concurrency from the settings."""
+        if config.ai.cache_enabled:
+            self._cache = ResponseCache(ttl_days=config.ai.cache_ttl_days)
+        self._concurrency = config.ai.concurrency
+        if config.ai.max_in_flight:
+            self._in_flight = threading.Semaphore(config.ai.max_in_flight)
+
+    def _cache_key(self, provider: str, prompt: str, system_prompt: str | None) -> str:
+        """Build the response cache key for a request."""
+        return cache_key(provider, self.model, self.max_tokens, system_prompt or "", prompt)
+
+    def _cached(
+        self,
+        provider: str,
+        prompt: str,
+        system_prompt: str | None,
+        produce: Callable[[], str],
+        parse: Callable[[str], T],
+    ) -> T:
+        """Get the response for a request from the cache, or produce and cache it.
+
+        The response is returned through `parse` (`str` for plain text), and is only
+        cached once it parses, so a malformed reply isn't replayed until it expires.
+        """
+        if self._cache is None:
+            return parse(produce())
+        key = self._cache_key(provider, prompt, system_prompt)
+        response = self._cache.get(key)
+        if response is not None:
+            try:
+                return parse(response)
+            except ValueError:
+                pass  # Cached before responses were parsed; ask again
+        response = produce()
+        result = parse(response)
+        if response:
+            self._cache.set(key, response)
+        return result
+
     @abstractmethod
     def generate(self, prompt: str, system_prompt: str | None = None) -> str:
         """Generate text from the AI model."""
         pass
 
+    def generate_stream(self, prompt: str, system_prompt: str | None = None) -> Iterator[str]:
+        """Generate text from the AI model, yielding it in pieces as it arrives."""
+        yield self.generate(prompt, system_prompt)
+
     @abstractmethod
-    def generate_json(
-        self, prompt: str, system_prompt: str | None = None
-    ) -> dict:
+    def generate_json(self, prompt: str, system_prompt: str | None = None) -> dict:
         """Generate JSON response from the AI model."""
         pass
 
+    async def generate_json_async(self, prompt: str, system_prompt: str | None = None) -> dict:
+        """Generate JSON response without blocking the event loop."""
+        return await asyncio.to_thread(self.generate_json, prompt, system_prompt)
+
+    def generate_structured(
+        self, prompt: str, schema: dict, system_prompt: str | None = None
+    ) -> dict:
+        """Generate a JSON object following a JSON schema.
+
+        The default asks for the schema in the prompt; providers with structured
+        output modes guarantee it instead.
+        """
+        schema_json = json.dumps(schema, ensure_ascii=False, indent=2)
+        return self.generate_json(
+            f"{prompt}\n\nRespond with a JSON object matching this JSON schema:\n{schema_json}",
+            system_prompt,
+        )
+
+    def generate_json_many(self, items: list[tuple[str, str | None]]) -> list[dict]:
+        """Generate JSON responses for (prompt, system_prompt) pairs concurrently, in order.
+
+        Requests are network-bound, so they run on a thread pool.
+        """
+        if not items:
+            return []
+
+        def generate(item: tuple[str, str | None]) -> dict:
+            if self._in_flight is None:
+                return self.generate_json(*item)
+            with self._in_flight:
+                return self.generate_json(*item)
+
+        with ThreadPoolExecutor(max_workers=min(self._concurrency, len(items))) as executor:
+            return list(executor.map(generate, items))
+
+    def generate_json_multi(
+        self, items: list[str], instruction: str, system_prompt: str | None = None
+    ) -> list[dict]:
+        """Apply one instruction to many items, getting a JSON object per item, in order.
+
+        Items are numbered in a single prompt per group, with groups sized to fit
+        the model's context window next to the response. A group whose response
+        doesn't hold one object per item is redone with a request per item.
+        """
+        reserved = (
+            self.max_tokens + _estimate_tokens(instruction) + _estimate_tokens(system_prompt or "")
+        )
+        budget = self.max_context_tokens - reserved
+        groups: list[list[str]] = []
+        group_tokens = 0
+        for item in items:
+            tokens = _estimate_tokens(item)
+            if not groups or group_tokens + tokens > budget:
+                groups.append([])
+                group_tokens = 0
+            groups[-1].append(item)
+            group_tokens += tokens
+
+        responses = self.generate_json_many(
+            [(self._multi_prompt(group, instruction), system_prompt) for group in groups]
+        )
+
+        results: list[dict] = []
+        for group, response in zip(groups, responses):
+            # A top-level JSON array parses too, but has no "results"
+            group_results = response.get("results") if isinstance(response, dict) else None
+            if (
+                isinstance(group_results, list)
+                and len(group_results) == len(group)
+                and all(isinstance(result, dict) for result in group_results)
+            ):
+                results.extend(group_results)
+            else:
+                results.extend(
+                    self.generate_json_many(
+                        [(f"{instruction}\n\n{item}", system_prompt) for item in group]
+                    )
+                )
+        return results
+
+    @staticmethod
+    def _multi_prompt(items: list[str], instruction: str) -> str:
+        """Build a prompt applying an instruction to each of several numbered items."""
+        numbered = "\n\n".join(f"[{i}]\n{item}" for i, item in enumerate(items, start=1))
+        return f"""{instruction}
+
+Apply the instruction above to each of the {len(items)} numbered items below, separately.
+Respond with a JSON object of the form {{"results": [...]}}, where "results" holds exactly
+{len(items)} JSON objects, the result for each item in the same order as the items.
+
+{numbered}"""
+
+    def generate_json_batch(self, items: list[tuple[str, str | None]]) -> list[dict]:
+        """Generate JSON responses for many (prompt, system_prompt) pairs, in order.
+
+        Meant for bulk, non-interactive work: providers with a batch API may take
+        minutes to return. The default makes one request per item.
+        """
+        return [self.generate_json(prompt, system_prompt) for prompt, system_prompt in items]
+
 
 class ClaudeService(AIService):
     """Claude AI service implementation."""
 
+    provider = "claude"
+
     def __init__(self, config: Settings | None = None):
+        import anthropic
+
         self.config = config or settings()
-        self.client = anthropic.Anthropic(api_key=self.config.anthropic_api_key)
+        self.client = anthropic.Anthropic(
+            api_key=self.config.anthropic_api_key,
+            http_client=anthropic.DefaultHttpxClient(http2=http2_available()),
+        )
         self.model = self.config.ai.claude.model
         self.max_tokens = self.config.ai.claude.max_tokens
+        self.max_context_tokens = self.config.ai.claude.max_context_tokens
+        self.prompt_caching = self.config.ai.claude.prompt_caching
+        self._init_from_config(self.config)
+
+    def _system_param(self, system_prompt: str | None) -> str | list[dict]:
+        """Build the system parameter, marking long prompts for prompt caching.
+
+        Shorter prompts can't be cached, and marking them would only add the
+        cache-write cost.
+        """
+        # A quarter of the UTF-8 size estimates tokens on the low side (Korean runs
+        # higher), so prompts below the minimum are never marked
+        if (
+            self.prompt_caching
+            and system_prompt
+            and len(system_prompt.encode("utf-8")) // 4 >= PROMPT_CACHE_MIN_TOKENS
+        ):
+            return [{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}]
+        return system_prompt or ""
 
     def generate(self, prompt: str, system_prompt: str | None = None) -> str:
         """Generate text using Claude."""
+        return self._cached(
+            self.provider,
+            prompt,
+            system_prompt,
+            lambda: "".join(self.generate_stream(prompt, system_prompt)),
+            str,
+        )
+
+    def generate_stream(self, prompt: str, system_prompt: str | None = None) -> Iterator[str]:
+        """Stream text deltas from Claude."""
         messages = [{"role": "user", "content": prompt}]
 
-        response = self.client.messages.create(
+        with self.client.messages.stream(
             model=self.model,
             max_tokens=self.max_tokens,
-            system=system_prompt or "",
+            system=self._system_param(system_prompt),
             messages=messages,
-        )
+        ) as stream:
+            yield from stream.text_stream
 
-        return response.content[0].text
+    def generate_json(self, prompt: str, system_prompt: str | None = None) -> dict:
+        """Generate JSON response using Claude."""
+        json_prompt = self._json_prompt(prompt)
+        return self._cached(
+            self.provider,
+            json_prompt,
+            system_prompt,
+            lambda: "".join(self.generate_stream(json_prompt, system_prompt)),
+            _parse_json_response,
+        )
 
-    def generate_json(
-        self, prompt: str, system_prompt: str | None = None
+    def generate_structured(
+        self, prompt: str, schema: dict, system_prompt: str | None = None
     ) -> dict:
-        """Generate JSON response using Claude."""
-        json_prompt = f"""{prompt}
+        """Generate a JSON object following a JSON schema, without parsing any text.
+
+        Claude is made to call a tool whose input schema is `schema`, and the
+        tool input is the result.
+        """
+
+        def request() -> str:
+            message = self.client.messages.create(
+                model=self.model,
+                max_tokens=self.max_tokens,
+                system=self._system_param(system_prompt),
+                messages=[{"role": "user", "content": prompt}],
+                tools=[
+                    {
+                        "name": STRUCTURED_TOOL_NAME,
+                        "description": "Respond with the requested data.",
+                        "input_schema": schema,
+                    }
+                ],
+                tool_choice={"type": "tool", "name": STRUCTURED_TOOL_NAME},
+            )
+            tool_input = next(
+                (block.input for block in message.content if block.type == "tool_use"), None
+            )
+            if tool_input is None:
+                raise ValueError(
+                    f"Response has no {STRUCTURED_TOOL_NAME} tool call "
+                    f"(stop_reason: {message.stop_reason})"
+                )
+            return json.dumps(tool_input, ensure_ascii=False)
+
+        # The schema is part of the request, so it's part of the cache key
+        cache_prompt = f"{json.dumps(schema, sort_keys=True)}|{prompt}"
+        return self._cached("claude-structured", cache_prompt, system_prompt, request, orjson.loads)
+
+    @staticmethod
+    def _json_prompt(prompt: str) -> str:
+        """Add the JSON-only instruction to a prompt."""
+        return f"""{prompt}
 
 IMPORTANT: Respond with valid JSON only. Do not include any text before or after the JSON."""
 
-        response = self.generate(json_prompt, system_prompt)
+    def generate_json_batch(
+        self, items: list[tuple[str, str | None]], max_wait_sec: float = BATCH_MAX_WAIT_SEC
+    ) -> list[dict]:
+        """Generate JSON responses through the Message Batches API, at half the cost.
+
+        Requests are split into batches within the API limits, each waited on for
+        at most `max_wait_sec`. Cached responses are reused and new ones are cached
+        as each batch ends. Requests that don't succeed in the batch, or whose reply
+        isn't JSON, are retried one at a time.
+        """
+        requests = [(self._json_prompt(prompt), system_prompt) for prompt, system_prompt in items]
+        results: list[dict | None] = [None] * len(requests)
+        if self._cache is not None:
+            for i, request in enumerate(requests):
+                results[i] = self._parse_or_none(
+                    self._cache.get(self._cache_key(self.provider, *request))
+                )
+
+        pending = {i: self._batch_params(*requests[i]) for i, r in enumerate(results) if r is None}
+        for group in self._group_for_batches(pending):
+            for i, text in self._run_batch(group, max_wait_sec).items():
+                results[i] = self._parse_or_none(text)
+                # Only replies that parse are cached; the rest are retried below
+                if self._cache is not None and results[i] is not None:
+                    self._cache.set(self._cache_key(self.provider, *requests[i]), text)
+
+        return [
+            result if result is not None else self.generate_json(prompt, system_prompt)
+            for result, (prompt, system_prompt) in zip(results, items)
+        ]
+
+    @staticmethod
+    def _parse_or_none(response: str | None) -> dict | None:
+        """Parse a JSON response, or get None if there is none or it doesn't parse."""
+        if response is None:
+            return None
+        try:
+            return _parse_json_response(response)
+        except ValueError:
+            return None
+
+    def _batch_params(self, prompt: str, system_prompt: str | None) -> dict:
+        """Build the message parameters of a batch request."""
+        return {
+            "model": self.model,
+            "max_tokens": self.max_tokens,
+            "system": self._system_param(system_prompt),
+            "messages": [{"role": "user", "content": prompt}],
+        }
+
+    @staticmethod
+    def _group_for_batches(requests: dict[int, dict]) -> list[dict[int, dict]]:
+        """Group batch requests into batches within the request count and size limits."""
+        batches: list[dict[int, dict]] = []
+        current: dict[int, dict] = {}
+        current_size = 0
+        for i, params in requests.items():
+            size = len(json.dumps({"custom_id": str(i), "params": params}).encode("utf-8"))
+            if current and (
+                len(current) >= MAX_BATCH_REQUESTS or current_size + size > MAX_BATCH_BYTES
+            ):
+                batches.append(current)
+                current, current_size = {}, 0
+            current[i] = params
+            current_size += size
+        if current:
+            batches.append(current)
+        return batches
+
+    def _run_batch(self, requests: dict[int, dict], max_wait_sec: float) -> dict[int, str]:
+        """Submit a message batch, wait for it to end, and get each succeeded response."""
+        batch = self.client.messages.batches.create(
+            requests=[{"custom_id": str(i), "params": params} for i, params in requests.items()]
+        )
 
-        return _parse_json_response(response)
+        deadline = time.monotonic() + max_wait_sec
+        delay = BATCH_POLL_INITIAL_SEC
+        while batch.processing_status != "ended":
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self.client.messages.batches.cancel(batch.id)
+                raise TimeoutError(f"Message batch {batch.id} did not end in {max_wait_sec}s")
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, BATCH_POLL_MAX_SEC)
+            batch = self.client.messages.batches.retrieve(batch.id)
+
+        texts = {}
+        for entry in self.client.messages.batches.results(batch.id):
+            if entry.result.type == "succeeded":
+                texts[int(entry.custom_id)] = "".join(
+                    block.text for block in entry.result.message.content if block.type == "text"
+                )
+        return texts
 
 
 class OpenAIService(AIService):
     """OpenAI service implementation."""
 
+    provider = "openai"
+
     def __init__(self, config: Settings | None = None):
+        import openai
+
         self.config = config or settings()
-        self.client = openai.OpenAI(api_key=self.config.openai_api_key)
+        self.client = openai.OpenAI(
+            api_key=self.config.openai_api_key,
+            http_client=openai.DefaultHttpxClient(http2=http2_available()),
+        )
         self.model = self.config.ai.openai.model
         self.max_tokens = self.config.ai.openai.max_tokens
+        self.max_context_tokens = self.config.ai.openai.max_context_tokens
+        self._init_from_config(self.config)
 
     def generate(self, prompt: str, system_prompt: str | None = None) -> str:
         """Generate text using OpenAI."""
+        return self._cached(
+            self.provider,
+            prompt,
+            system_prompt,
+            lambda: "".join(self.generate_stream(prompt, system_prompt)),
+            str,
+        )
+
+    def generate_stream(self, prompt: str, system_prompt: str | None = None) -> Iterator[str]:
+        """Stream text deltas from OpenAI."""
         messages = []
         if system_prompt:
             messages.append({"role": "system", "content": system_prompt})
         messages.append({"role": "user", "content": prompt})
 
-        response = self.client.chat.completions.create(
+        stream = self.client.chat.completions.create(
             model=self.model,
             max_tokens=self.max_tokens,
             messages=messages,
+            stream=True,
         )
+        yield from _chat_deltas(stream)
 
-        return response.choices[0].message.content or ""
-
-    def generate_json(
-        self, prompt: str, system_prompt: str | None = None
-    ) -> dict:
+    def generate_json(self, prompt: str, system_prompt: str | None = None) -> dict:
         """Generate JSON response using OpenAI."""
         messages = []
         if system_prompt:
@@ -119,58 +505,104 @@ class OpenAIService(AIService):
 IMPORTANT: Respond with valid JSON only. Do not include any text before or after the JSON."""
         messages.append({"role": "user", "content": json_prompt})
 
-        response = self.client.chat.completions.create(
-            model=self.model,
-            max_tokens=self.max_tokens,
-            messages=messages,
-            response_format={"type": "json_object"},
-        )
+        def request() -> str:
+            response = self.client.chat.completions.create(
+                model=self.model,
+                max_tokens=self.max_tokens,
+                messages=messages,
+                response_format={"type": "json_object"},
+            )
+            return response.choices[0].message.content or "{}"
 
-        content = response.choices[0].message.content or "{}"
-        return json.loads(content)
+        # JSON mode requests differ from generate() calls with the same prompt
+        return self._cached("openai-json", json_prompt, system_prompt, request, orjson.loads)
 
 
 class OllamaService(AIService):
     """Ollama service implementation using OpenAI-compatible API."""
 
+    provider = "ollama"
+
     def __init__(self, config: Settings | None = None):
+        import openai
+
         self.config = config or settings()
         self.client = openai.OpenAI(
             base_url=self.config.ai.ollama.base_url,
             api_key="ollama",  # Ollama는 API 키가 필요 없지만 클라이언트 요구사항 충족용
+            http_client=openai.DefaultHttpxClient(http2=http2_available()),
         )
         self.model = self.config.ai.ollama.model
         self.max_tokens = self.config.ai.ollama.max_tokens
+        self.max_context_tokens = self.config.ai.ollama.max_context_tokens
+        self._init_from_config(self.config)
+        if self.config.ai.ollama.prewarm:
+            self._prewarm()
+
+    def _prewarm(self) -> None:
+        """Load the model in a background thread, so the first request doesn't wait.
+
+        Loading a model can take tens of seconds. Ollama's native API loads it
+        when asked to generate without a prompt.
+        """
+        import httpx
+
+        url = str(self.client.base_url).rstrip("/").removesuffix("/v1") + "/api/generate"
+        payload = {"model": self.model, "keep_alive": OLLAMA_PREWARM_KEEP_ALIVE}
+
+        def load() -> None:
+            try:
+                httpx.post(url, json=payload, timeout=300)
+            except httpx.HTTPError:
+                pass  # Requests report an unreachable server themselves
+
+        threading.Thread(target=load, name="ollama-prewarm", daemon=True).start()
 
     def generate(self, prompt: str, system_prompt: str | None = None) -> str:
         """Generate text using Ollama."""
+        return self._cached(
+            self.provider,
+            prompt,
+            system_prompt,
+            lambda: "".join(self.generate_stream(prompt, system_prompt)),
+            str,
+        )
+
+    def generate_stream(self, prompt: str, system_prompt: str | None = None) -> Iterator[str]:
+        """Stream text deltas from Ollama."""
+        import openai
+
         messages = []
         if system_prompt:
             messages.append({"role": "system", "content": system_prompt})
         messages.append({"role": "user", "content": prompt})
 
         try:
-            response = self.client.chat.completions.create(
+            stream = self.client.chat.completions.create(
                 model=self.model,
                 max_tokens=self.max_tokens,
                 messages=messages,
+                stream=True,
             )
+            yield from _chat_deltas(stream)
         except openai.APIConnectionError:
             raise ConnectionError(
-                f"Ollama 서버에 연결할 수 없습니다. ({self.client.base_url}) 'ollama serve'가 실행 중인지 확인해주세요."
+                f"Ollama 서버에 연결할 수 없습니다. ({self.client.base_url}) "
+                "'ollama serve'가 실행 중인지 확인해주세요."
             )
 
-        return response.choices[0].message.content or ""
-
-    def generate_json(
-        self, prompt: str, system_prompt: str | None = None
-    ) -> dict:
+    def generate_json(self, prompt: str, system_prompt: str | None = None) -> dict:
         """Generate JSON response using Ollama."""
         json_prompt = f"""{prompt}
 
 IMPORTANT: Respond with valid JSON only. Do not include any text before or after the JSON."""
-        response = self.generate(json_prompt, system_prompt)
-        return _parse_json_response(response)
+        return self._cached(
+            self.provider,
+            json_prompt,
+            system_prompt,
+            lambda: "".join(self.generate_stream(json_prompt, system_prompt)),
+            _parse_json_response,
+        )
 
 
 def get_ai_service(provider: str | None = None, config: Settings | None = None) -> AIService:
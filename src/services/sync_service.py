@@ -2,10 +2,29 @@
 
 from pathlib import Path
 
-from src.models.presentation import Presentation, Slide, SyncData, SyncInfo
+import numpy as np
+
+from src.models.presentation import Presentation, SyncData, SyncInfo
 from src.models.script import Script
 
 
+def _back_to_back(durations: np.ndarray) -> tuple[list[float], list[float]]:
+    """Get start and end times of segments played one after another from zero."""
+    ends = np.cumsum(durations, dtype=float)
+    # Shifting the running sum (rather than ends - durations) keeps each start
+    # exactly equal to the previous end
+    starts = np.concatenate(([0.0], ends[:-1]))
+    return starts.tolist(), ends.tolist()
+
+
+def _lay_out(sync_items: list[SyncInfo], durations: np.ndarray) -> None:
+    """Set item times so the items play one after another for the given durations."""
+    starts, ends = _back_to_back(durations)
+    for sync_item, start, end in zip(sync_items, starts, ends):
+        sync_item.start_time = start
+        sync_item.end_time = end
+
+
 class SyncService:
     """Service for synchronizing slides with audio timing."""
 
@@ -25,52 +44,43 @@ class SyncService:
         Returns:
             SyncData with timing information for each slide
         """
-        sync_items = []
-        current_time = 0.0
+        # Items are created untimed, then laid out from their durations
+        sync_items: list[SyncInfo] = []
+        durations: list[float] = []
+        num_slides = len(presentation.slides)
 
         # Create a mapping from section_id to audio info
         audio_map = {section_id: (path, duration) for section_id, path, duration in audio_durations}
 
         # First slide is usually the title slide
         # Map it to a short intro or skip
-        if len(presentation.slides) > len(script.sections):
+        if num_slides > len(script.sections):
             # Title slide gets a short duration
             title_duration = 3.0  # 3 seconds for title slide
-            sync_items.append(
-                SyncInfo(
-                    slide_index=0,
-                    section_id=0,
-                    start_time=current_time,
-                    end_time=current_time + title_duration,
-                    audio_file=None,
-                )
-            )
-            current_time += title_duration
+            sync_items.append(SyncInfo(slide_index=0, section_id=0, start_time=0.0, end_time=0.0))
+            durations.append(title_duration)
             slide_offset = 1
         else:
             slide_offset = 0
 
-        # Map sections to slides
-        for i, section in enumerate(script.sections):
-            slide_index = i + slide_offset
-
-            if slide_index >= len(presentation.slides):
-                break
-
-            audio_path, duration = audio_map.get(section.section_id, (None, section.estimated_duration_sec))
-
+        # Map sections to slides; sections beyond the last slide are dropped
+        sections = script.sections[: max(num_slides - slide_offset, 0)]
+        for slide_index, section in enumerate(sections, start=slide_offset):
+            audio_path, duration = audio_map.get(
+                section.section_id, (None, section.estimated_duration_sec)
+            )
             sync_items.append(
                 SyncInfo(
                     slide_index=slide_index,
                     section_id=section.section_id,
-                    start_time=current_time,
-                    end_time=current_time + duration,
+                    start_time=0.0,
+                    end_time=0.0,
                     audio_file=audio_path,
                 )
             )
+            durations.append(duration)
 
-            current_time += duration
-
+        _lay_out(sync_items, np.array(durations, dtype=float))
         sync_data = SyncData(sync_items=sync_items)
         sync_data.calculate_total_duration()
 
@@ -96,20 +106,11 @@ class SyncService:
                 f"number of slides ({len(presentation.slides)})"
             )
 
-        sync_items = []
-        current_time = 0.0
-
-        for i, (slide, duration) in enumerate(zip(presentation.slides, durations)):
-            sync_items.append(
-                SyncInfo(
-                    slide_index=i,
-                    section_id=i,
-                    start_time=current_time,
-                    end_time=current_time + duration,
-                    audio_file=None,
-                )
-            )
-            current_time += duration
+        starts, ends = _back_to_back(np.array(durations, dtype=float))
+        sync_items = [
+            SyncInfo(slide_index=i, section_id=i, start_time=start, end_time=end)
+            for i, (start, end) in enumerate(zip(starts, ends))
+        ]
 
         sync_data = SyncData(sync_items=sync_items)
         sync_data.calculate_total_duration()
@@ -133,6 +134,7 @@ class SyncService:
         for sync_item in sync_data.sync_items:
             if sync_item.section_id in audio_files:
                 sync_item.audio_file = audio_files[sync_item.section_id]
+        sync_data.mark_changed()
 
         return sync_data
 
@@ -150,17 +152,21 @@ class SyncService:
         Returns:
             Updated SyncData with adjusted timing
         """
-        current_time = 0.0
-
-        for sync_item in sync_data.sync_items:
-            if sync_item.section_id in actual_durations:
-                duration = actual_durations[sync_item.section_id]
-            else:
-                duration = sync_item.duration
-
-            sync_item.start_time = current_time
-            sync_item.end_time = current_time + duration
-            current_time += duration
+        durations = sync_data.end_times - sync_data.start_times
+        if actual_durations:
+            # Look up each item's section among the sorted actual-duration IDs
+            ids = np.fromiter(actual_durations, dtype=np.int64, count=len(actual_durations))
+            values = np.fromiter(
+                actual_durations.values(), dtype=float, count=len(actual_durations)
+            )
+            order = np.argsort(ids)
+            ids, values = ids[order], values[order]
+            positions = np.searchsorted(ids, sync_data.section_ids).clip(max=len(ids) - 1)
+            durations = np.where(
+                ids[positions] == sync_data.section_ids, values[positions], durations
+            )
+        _lay_out(sync_data.sync_items, durations)
+        sync_data.mark_changed()
 
         sync_data.calculate_total_duration()
         return sync_data
@@ -175,7 +181,5 @@ class SyncService:
         Returns:
             Slide index or None if time is out of range
         """
-        for sync_item in sync_data.sync_items:
-            if sync_item.start_time <= time < sync_item.end_time:
-                return sync_item.slide_index
-        return None
+        sync_item = sync_data.item_at_time(time)
+        return sync_item.slide_index if sync_item is not None else None
@@ -1,21 +1,40 @@
 """YouTube upload service using Google API."""
 
-import json
+import io
 import os
+import tempfile
+from collections.abc import Generator
+from functools import lru_cache
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload
+import orjson
 
 from src.config import Settings, settings
 from src.utils.helpers import ensure_dir
 
+if TYPE_CHECKING:
+    from google.oauth2.credentials import Credentials
+
 
 # OAuth2 scopes for YouTube upload
 SCOPES = ["https://www.googleapis.com/auth/youtube.upload"]
 
+# Resumable upload chunks other than the last must be a multiple of this size
+UPLOAD_CHUNK_ALIGNMENT = 256 * 1024
+
+# Larger thumbnails are streamed from disk instead of read into memory
+THUMBNAIL_IN_MEMORY_MAX_BYTES = 5 * 1024 * 1024
+
+# Retries per chunk on 5xx/429 responses and dropped connections, with backoff
+UPLOAD_NUM_RETRIES = 5
+
+
+@lru_cache(maxsize=1)
+def _load_credentials_info(path: str, mtime_ns: int) -> dict:
+    """Read saved authorized-user info, memoized on path and modification time."""
+    return orjson.loads(Path(path).read_bytes())
+
 
 class YouTubeService:
     """Service for uploading videos to YouTube."""
@@ -24,23 +43,34 @@ class YouTubeService:
         self.config = config or settings()
         self.youtube_config = self.config.youtube
         self._service = None
-        self._credentials_path = Path.home() / ".config" / "contents-autouploader" / "youtube_credentials.json"
+        self._credentials: Credentials | None = None
+        self._credentials_path = (
+            Path.home() / ".config" / "contents-autouploader" / "youtube_credentials.json"
+        )
 
-    def _get_credentials(self) -> Credentials:
+    def _get_credentials(self) -> "Credentials":
         """Get or refresh YouTube API credentials."""
-        ensure_dir(self._credentials_path.parent)
+        if self._credentials is not None and self._credentials.valid:
+            return self._credentials
+
+        from google.oauth2.credentials import Credentials
+        from google_auth_oauthlib.flow import InstalledAppFlow
 
         # Check for existing credentials
         if self._credentials_path.exists():
-            with open(self._credentials_path) as f:
-                creds_data = json.load(f)
+            creds_data = _load_credentials_info(
+                str(self._credentials_path), self._credentials_path.stat().st_mtime_ns
+            )
             credentials = Credentials.from_authorized_user_info(creds_data, SCOPES)
             if credentials.valid:
+                self._credentials = credentials
                 return credentials
             if credentials.expired and credentials.refresh_token:
                 from google.auth.transport.requests import Request
+
                 credentials.refresh(Request())
                 self._save_credentials(credentials)
+                self._credentials = credentials
                 return credentials
 
         # Need to authenticate
@@ -57,11 +87,12 @@ class YouTubeService:
         flow = InstalledAppFlow.from_client_config(client_config, SCOPES)
         credentials = flow.run_local_server(port=8080)
         self._save_credentials(credentials)
+        self._credentials = credentials
 
         return credentials
 
-    def _save_credentials(self, credentials: Credentials) -> None:
-        """Save credentials to file."""
+    def _save_credentials(self, credentials: "Credentials") -> None:
+        """Save credentials to a file only the user can read, replacing it atomically."""
         creds_data = {
             "token": credentials.token,
             "refresh_token": credentials.refresh_token,
@@ -70,12 +101,27 @@ class YouTubeService:
             "client_secret": credentials.client_secret,
             "scopes": credentials.scopes,
         }
-        with open(self._credentials_path, "w") as f:
-            json.dump(creds_data, f)
+        ensure_dir(self._credentials_path.parent)
+        # mkstemp creates the file with mode 0600
+        fd, tmp_path = tempfile.mkstemp(dir=self._credentials_path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(orjson.dumps(creds_data))
+            os.replace(tmp_path, self._credentials_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def _upload_chunk_size(self) -> int:
+        """Get the configured upload chunk size, aligned as the API requires."""
+        chunk_size = self.youtube_config.chunk_size // UPLOAD_CHUNK_ALIGNMENT
+        return max(chunk_size, 1) * UPLOAD_CHUNK_ALIGNMENT
 
     def _get_service(self):
         """Get YouTube API service."""
         if self._service is None:
+            from googleapiclient.discovery import build
+
             credentials = self._get_credentials()
             self._service = build("youtube", "v3", credentials=credentials)
         return self._service
@@ -104,9 +150,43 @@ class YouTubeService:
         Returns:
             Video ID of the uploaded video
         """
+        chunks = self.iter_upload(
+            video_path, title, description, tags, category_id, privacy_status, thumbnail_path
+        )
+        while True:
+            try:
+                uploaded, total = next(chunks)
+            except StopIteration as done:
+                video_id = done.value
+                break
+            print(f"Upload progress: {uploaded * 100 // max(total, 1)}%")
+
+        print(f"Video uploaded successfully: https://www.youtube.com/watch?v={video_id}")
+        return video_id
+
+    def iter_upload(
+        self,
+        video_path: Path | str,
+        title: str,
+        description: str,
+        tags: list[str] | None = None,
+        category_id: str | None = None,
+        privacy_status: str | None = None,
+        thumbnail_path: Path | str | None = None,
+    ) -> Generator[tuple[int, int], None, str]:
+        """Upload a video to YouTube in resumable chunks.
+
+        Takes the same arguments as upload(). Yields (bytes_uploaded, total_bytes)
+        after each chunk and returns the video ID. A chunk that fails with a server
+        error or a dropped connection is retried from where the upload left off.
+        """
         video_path = Path(video_path)
         if not video_path.exists():
             raise FileNotFoundError(f"Video file not found: {video_path}")
+        # The thumbnail can only be set once the last chunk returns the video ID,
+        # so check for it before spending the upload on a video left without one
+        if thumbnail_path and not Path(thumbnail_path).exists():
+            raise FileNotFoundError(f"Thumbnail file not found: {thumbnail_path}")
 
         tags = tags or self.youtube_config.default_tags
         category_id = category_id or self.youtube_config.category_id
@@ -125,12 +205,14 @@ class YouTubeService:
             },
         }
 
+        from googleapiclient.http import MediaFileUpload
+
         service = self._get_service()
 
         # Upload video
         media = MediaFileUpload(
             str(video_path),
-            chunksize=1024 * 1024,  # 1MB chunks
+            chunksize=self._upload_chunk_size(),
             resumable=True,
             mimetype="video/mp4",
         )
@@ -141,15 +223,15 @@ class YouTubeService:
             media_body=media,
         )
 
+        total = media.size()
         response = None
         while response is None:
-            status, response = request.next_chunk()
+            status, response = request.next_chunk(num_retries=UPLOAD_NUM_RETRIES)
             if status:
-                progress = int(status.progress() * 100)
-                print(f"Upload progress: {progress}%")
+                yield status.resumable_progress, total
+        yield total, total
 
         video_id = response["id"]
-        print(f"Video uploaded successfully: https://www.youtube.com/watch?v={video_id}")
 
         # Upload thumbnail if provided
         if thumbnail_path:
@@ -168,12 +250,18 @@ class YouTubeService:
         if not thumbnail_path.exists():
             raise FileNotFoundError(f"Thumbnail file not found: {thumbnail_path}")
 
+        from googleapiclient.http import MediaFileUpload, MediaIoBaseUpload
+
         service = self._get_service()
 
-        media = MediaFileUpload(
-            str(thumbnail_path),
-            mimetype="image/png",
-        )
+        # Thumbnails are small, so read once and send in a single request
+        if thumbnail_path.stat().st_size <= THUMBNAIL_IN_MEMORY_MAX_BYTES:
+            media = MediaIoBaseUpload(io.BytesIO(thumbnail_path.read_bytes()), mimetype="image/png")
+        else:
+            media = MediaFileUpload(
+                str(thumbnail_path),
+                mimetype="image/png",
+            )
 
         service.thumbnails().set(
             videoId=video_id,
@@ -197,10 +285,14 @@ class YouTubeService:
         """
         service = self._get_service()
 
-        response = service.videos().list(
-            part="status,processingDetails",
-            id=video_id,
-        ).execute()
+        response = (
+            service.videos()
+            .list(
+                part="status,processingDetails",
+                id=video_id,
+            )
+            .execute()
+        )
 
         if response["items"]:
             video = response["items"][0]
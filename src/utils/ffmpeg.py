@@ -0,0 +1,134 @@
+"""Helpers for invoking the ffmpeg command-line tool."""
+
+import re
+import subprocess
+from functools import cache, lru_cache
+from pathlib import Path
+
+_DURATION_RE = re.compile(r"Duration: (\d+):(\d{2}):(\d{2}(?:\.\d+)?)")
+
+
+@lru_cache(maxsize=1)
+def get_ffmpeg_exe() -> str:
+    """Get the ffmpeg binary path (bundled with imageio-ffmpeg, a moviepy dependency)."""
+    import imageio_ffmpeg
+
+    return str(imageio_ffmpeg.get_ffmpeg_exe())
+
+
+@lru_cache(maxsize=1)
+def available_encoders() -> frozenset[str]:
+    """Get the names of the encoders compiled into the ffmpeg binary."""
+    result = subprocess.run(
+        [get_ffmpeg_exe(), "-hide_banner", "-encoders"], capture_output=True, text=True
+    )
+    # The listing starts after a legend terminated by " ------"; each entry then
+    # looks like " V....D libx264   libx264 H.264 / AVC ..."
+    _, _, listing = result.stdout.partition(" ------\n")
+    return frozenset(line.split()[1] for line in listing.splitlines() if line.strip())
+
+
+@lru_cache(maxsize=1)
+def available_filters() -> frozenset[str]:
+    """Get the names of the filters compiled into the ffmpeg binary."""
+    result = subprocess.run(
+        [get_ffmpeg_exe(), "-hide_banner", "-filters"], capture_output=True, text=True
+    )
+    # Entries follow a legend ending in "| = Source or sink filter" and look like
+    # " .S. xfade             VV->V      Cross fade one video with another video."
+    _, _, listing = result.stdout.partition("Source or sink filter\n")
+    return frozenset(line.split()[1] for line in listing.splitlines() if line.strip())
+
+
+@cache
+def can_run_filter(graph: str, device_args: tuple[str, ...] = ()) -> bool:
+    """Check whether a source-only filter graph runs here, e.g. on a GPU device."""
+    result = subprocess.run(
+        [
+            get_ffmpeg_exe(),
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            *device_args,
+            "-filter_complex",
+            graph,
+            "-f",
+            "null",
+            "-",
+        ],
+        capture_output=True,
+    )
+    return result.returncode == 0
+
+
+@cache
+def can_encode(
+    encoder: str, device_args: tuple[str, ...] = (), video_filter: str | None = None
+) -> bool:
+    """Check whether an encoder is usable here, not just compiled in.
+
+    Hardware encoders are listed by static ffmpeg builds even without a GPU, so
+    a short test clip is encoded to confirm the device is present. `device_args`
+    and `video_filter` are whatever the encoder needs to open and feed its device.
+    """
+    if encoder not in available_encoders():
+        return False
+    filter_args = ["-vf", video_filter] if video_filter else []
+    result = subprocess.run(
+        [
+            get_ffmpeg_exe(),
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            *device_args,
+            "-f",
+            "lavfi",
+            "-i",
+            "color=black:s=256x256:d=0.1",
+            *filter_args,
+            "-c:v",
+            encoder,
+            "-f",
+            "null",
+            "-",
+        ],
+        capture_output=True,
+    )
+    return result.returncode == 0
+
+
+def run_ffmpeg(*args: str | Path) -> None:
+    """Run ffmpeg with the given arguments, overwriting outputs.
+
+    Raises RuntimeError with ffmpeg's stderr if the command fails.
+    """
+    cmd = [get_ffmpeg_exe(), "-hide_banner", "-loglevel", "error", "-y", *map(str, args)]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed: {result.stderr.strip()}")
+
+
+def cut_audio(input_path: Path, output_path: Path, start: float, duration: float | None) -> None:
+    """Copy a time range of an audio file without re-encoding."""
+    args: list[str | Path] = ["-ss", f"{start:.3f}", "-i", input_path]
+    if duration is not None:
+        args += ["-t", f"{duration:.3f}"]
+    run_ffmpeg(*args, "-c", "copy", output_path)
+
+
+def probe_duration(path: Path) -> float:
+    """Get a media file's container duration in seconds."""
+    result = subprocess.run(
+        [get_ffmpeg_exe(), "-hide_banner", "-i", str(path)], capture_output=True, text=True
+    )
+    match = _DURATION_RE.search(result.stderr)
+    if match is None:
+        raise RuntimeError(f"Could not read duration of {path}: {result.stderr.strip()}")
+    hours, minutes, seconds = match.groups()
+    return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+
+def concat_entry(path: Path) -> str:
+    """Format a file line for an ffmpeg concat demuxer list."""
+    escaped = str(Path(path).resolve()).replace("'", "'\\''")
+    return f"file '{escaped}'"
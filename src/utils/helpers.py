@@ -4,11 +4,31 @@ import re
 from datetime import datetime
 from pathlib import Path
 
+_INVALID_FILENAME_CHARS = re.compile(r'[<>:"/\\|?*]')
+_WHITESPACE = re.compile(r"\s+")
+_KOREAN_CHAR = re.compile(r"[가-힣]")
+_ENGLISH_WORD = re.compile(r"[a-zA-Z]+")
+
+# Text length from which counting code points with NumPy beats the regexes
+_VECTORIZED_COUNT_MIN_CHARS = 200
+
+# Directories ensure_dir() has already created or found in this process
+_CREATED: set[Path] = set()
+
 
 def ensure_dir(path: Path | str) -> Path:
-    """Ensure a directory exists, creating it if necessary."""
+    """Ensure a directory exists, creating it if necessary.
+
+    Each path is only checked once per process; a directory removed after
+    that won't be recreated.
+    """
     path = Path(path)
-    path.mkdir(parents=True, exist_ok=True)
+    if path in _CREATED:
+        return path
+    # A stat is cheaper than a mkdir that fails because the directory exists
+    if not path.is_dir():
+        path.mkdir(parents=True, exist_ok=True)
+    _CREATED.add(path)
     return path
 
 
@@ -20,9 +40,9 @@ def get_timestamp() -> str:
 def sanitize_filename(filename: str, max_length: int = 100) -> str:
     """Sanitize a string to be used as a filename."""
     # Remove or replace invalid characters
-    sanitized = re.sub(r'[<>:"/\\|?*]', "", filename)
+    sanitized = _INVALID_FILENAME_CHARS.sub("", filename)
     # Replace spaces with underscores
-    sanitized = re.sub(r"\s+", "_", sanitized)
+    sanitized = _WHITESPACE.sub("_", sanitized)
     # Remove leading/trailing dots and spaces
     sanitized = sanitized.strip(". ")
     # Truncate if too long
@@ -38,12 +58,28 @@ def format_duration(seconds: float) -> str:
     return f"{minutes:02d}:{secs:02d}"
 
 
+def _count_speech_units(text: str) -> tuple[int, int]:
+    """Count Hangul syllables and ASCII-letter runs in one pass over the code points."""
+    import numpy as np
+
+    codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+    korean_chars = np.count_nonzero((codes >= 0xAC00) & (codes <= 0xD7A3))
+    lower = codes | 0x20  # Folds A-Z onto a-z without moving other characters into it
+    letters = (lower >= ord("a")) & (lower <= ord("z"))
+    # A word starts at each letter that doesn't follow another letter
+    english_words = np.count_nonzero(letters[1:] & ~letters[:-1]) + int(letters[:1].any())
+    return int(korean_chars), int(english_words)
+
+
 def estimate_speech_duration(text: str, words_per_minute: int = 150) -> float:
     """Estimate speech duration for given text based on word count."""
     # Korean character count (roughly 2 characters per syllable, 4 syllables per second)
-    korean_chars = len(re.findall(r"[가-힣]", text))
-    # English word count
-    english_words = len(re.findall(r"[a-zA-Z]+", text))
+    # and English word count
+    if len(text) < _VECTORIZED_COUNT_MIN_CHARS:
+        korean_chars = len(_KOREAN_CHAR.findall(text))
+        english_words = len(_ENGLISH_WORD.findall(text))
+    else:
+        korean_chars, english_words = _count_speech_units(text)
 
     # Estimate: Korean ~4 syllables/second, English ~2.5 words/second
     korean_duration = korean_chars / 8  # 2 chars/syllable, 4 syllables/second
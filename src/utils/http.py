@@ -0,0 +1,32 @@
+"""Shared HTTP client helpers."""
+
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import httpx
+
+
+@lru_cache(maxsize=1)
+def http2_available() -> bool:
+    """Check whether the h2 package needed for HTTP/2 in httpx is installed."""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def keepalive_http_client(timeout: float, max_keepalive_connections: int) -> "httpx.Client":
+    """HTTP client that keeps connections open across requests.
+
+    Uses HTTP/2 when the h2 package is available, otherwise HTTP/1.1 keep-alive.
+    """
+    import httpx
+
+    return httpx.Client(
+        http2=http2_available(),
+        timeout=timeout,
+        follow_redirects=True,
+        limits=httpx.Limits(max_keepalive_connections=max_keepalive_connections),
+    )
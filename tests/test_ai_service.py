@@ -0,0 +1,435 @@
+"""Tests for the AI service implementations."""
+
+import json
+import time
+from types import SimpleNamespace
+
+import openai
+import pytest
+
+from src.config import Settings
+from src.services.ai_cache import ResponseCache, cache_key
+from src.services.ai_service import (
+    ClaudeService,
+    OllamaService,
+    OpenAIService,
+    _parse_json_response,
+)
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """Keep response caches written by tests out of the user's cache directory."""
+    monkeypatch.setattr("src.services.ai_cache.CACHE_DIR", tmp_path / "ai")
+    return tmp_path / "ai"
+
+
+@pytest.fixture(autouse=True)
+def ollama_posts(monkeypatch):
+    """Record Ollama prewarm requests instead of sending them."""
+    posts = []
+    monkeypatch.setattr("httpx.post", lambda url, **kwargs: posts.append((url, kwargs["json"])))
+    return posts
+
+
+class FakeChatStream:
+    """Streamed chat completion yielding one chunk per text delta."""
+
+    def __init__(self, deltas):
+        self.deltas = deltas
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.closed = True
+
+    def __iter__(self):
+        for delta in self.deltas:
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=delta))])
+
+
+def fake_client(create):
+    """Build a stand-in OpenAI client whose chat completions call `create`."""
+    return SimpleNamespace(
+        base_url="http://localhost:11434/v1",
+        chat=SimpleNamespace(completions=SimpleNamespace(create=create)),
+    )
+
+
+class TestStreaming:
+    """Tests for streamed generation."""
+
+    def test_generate_joins_streamed_deltas(self):
+        """Test that generate assembles the deltas and closes the stream."""
+        stream = FakeChatStream(["안녕", None, "하세요"])
+        requests = []
+
+        def create(**kwargs):
+            requests.append(kwargs)
+            return stream
+
+        config = Settings(openai_api_key="test", ai={"cache_enabled": False})
+        service = OpenAIService(config=config)
+        service.client = fake_client(create)
+
+        assert list(service.generate_stream("prompt")) == ["안녕", "하세요"]
+        assert service.generate("prompt", "system") == "안녕하세요"
+        assert stream.closed
+        assert all(request["stream"] for request in requests)
+        assert requests[-1]["messages"][0] == {"role": "system", "content": "system"}
+
+    def test_ollama_connection_error_is_translated(self):
+        """Test that an unreachable Ollama server raises ConnectionError."""
+
+        def create(**kwargs):
+            raise openai.APIConnectionError(request=None)
+
+        service = OllamaService(config=Settings())
+        service.client = fake_client(create)
+
+        with pytest.raises(ConnectionError, match="ollama serve"):
+            service.generate("prompt")
+
+
+class TestOllamaPrewarm:
+    """Tests for loading the Ollama model ahead of the first request."""
+
+    def test_model_is_loaded_in_background(self, ollama_posts, monkeypatch):
+        """Test that creating the service asks Ollama's native API to load the model."""
+        threads = []
+        monkeypatch.setattr(
+            "threading.Thread.start",
+            lambda thread: threads.append(thread) or thread.run(),
+        )
+
+        OllamaService(config=Settings())
+
+        assert [thread.daemon for thread in threads] == [True]
+        assert ollama_posts == [
+            ("http://localhost:11434/api/generate", {"model": "llama3.2", "keep_alive": "30m"})
+        ]
+
+    def test_prewarm_can_be_disabled(self, ollama_posts):
+        """Test that nothing is sent when prewarm is off."""
+        OllamaService(config=Settings(ai={"ollama": {"prewarm": False}}))
+        assert ollama_posts == []
+
+
+class TestResponseCache:
+    """Tests for the on-disk response cache."""
+
+    def test_round_trip_and_expiry(self, tmp_path):
+        """Test that entries are returned until they outlive the TTL."""
+        cache = ResponseCache(ttl_days=1, directory=tmp_path)
+        key = cache_key("claude", "model", 100, "", "프롬프트")
+
+        assert cache.get(key) is None
+        cache.set(key, "응답")
+        assert cache.get(key) == "응답"
+
+        stale = {"response": "응답", "ts": time.time() - 2 * 86400}
+        (tmp_path / f"{key}.json").write_text(json.dumps(stale), encoding="utf-8")
+        assert cache.get(key) is None
+
+    def test_write_errors_are_logged_not_raised(self, tmp_path, monkeypatch, caplog):
+        """Test that a failed write leaves no temp file and doesn't raise."""
+        cache = ResponseCache(directory=tmp_path)
+
+        def fail_replace(src, dst):
+            raise OSError(28, "No space left on device")
+
+        monkeypatch.setattr("src.services.ai_cache.os.replace", fail_replace)
+        cache.set(cache_key("key"), "응답")
+
+        assert list(tmp_path.iterdir()) == []
+        assert "No space left" in caplog.text
+
+    def test_keys_keep_parts_apart(self):
+        """Test that parts containing the joiner or None don't collide."""
+        assert cache_key("a|b", "c") != cache_key("a", "b|c")
+        assert cache_key(None) != cache_key("None")
+        assert cache_key("1") != cache_key(1)
+
+    def test_generate_reuses_cached_response(self, cache_dir):
+        """Test that an identical request is answered from disk."""
+        calls = []
+
+        def create(**kwargs):
+            calls.append(kwargs)
+            return FakeChatStream(["응답"])
+
+        for _ in range(2):
+            service = OpenAIService(config=Settings(openai_api_key="test"))
+            service.client = fake_client(create)
+            assert service.generate("prompt", "system") == "응답"
+
+        assert service.generate("other prompt") == "응답"
+        assert len(calls) == 2
+        assert len(list(cache_dir.glob("*.json"))) == 2
+
+    def test_unparseable_json_reply_is_not_cached(self, cache_dir, monkeypatch):
+        """Test that a reply that isn't JSON raises and is asked for again next time."""
+        replies = iter(["죄송합니다", '{"title": "제목"}'])
+        service = OllamaService(config=Settings(ai={"ollama": {"prewarm": False}}))
+        monkeypatch.setattr(
+            service, "generate_stream", lambda prompt, system_prompt: [next(replies)]
+        )
+
+        with pytest.raises(ValueError):
+            service.generate_json("prompt")
+        assert list(cache_dir.glob("*.json")) == []
+
+        assert service.generate_json("prompt") == {"title": "제목"}
+        assert service.generate_json("prompt") == {"title": "제목"}
+        assert len(list(cache_dir.glob("*.json"))) == 1
+
+
+class TestClaudePromptCaching:
+    """Tests for Claude system prompt caching."""
+
+    def test_only_long_system_prompts_are_marked(self):
+        """Test that cache_control is added once the prompt is long enough to cache."""
+        service = ClaudeService(config=Settings(anthropic_api_key="test"))
+        long_prompt = "당신은 교육 콘텐츠 전문 작가입니다. " * 200
+
+        assert service._system_param(None) == ""
+        assert service._system_param("짧은 프롬프트") == "짧은 프롬프트"
+        assert service._system_param(long_prompt) == [
+            {"type": "text", "text": long_prompt, "cache_control": {"type": "ephemeral"}}
+        ]
+
+        service.prompt_caching = False
+        assert service._system_param(long_prompt) == long_prompt
+
+
+class TestClaudeStructured:
+    """Tests for schema-constrained generation through Claude tool use."""
+
+    def test_tool_input_is_returned_and_cached(self, cache_dir):
+        """Test that the forced tool call's input is the result, reused from the cache."""
+        calls = []
+
+        def create(**kwargs):
+            calls.append(kwargs)
+            text = SimpleNamespace(type="text", text="")
+            tool_use = SimpleNamespace(type="tool_use", input={"title": "제목", "tags": ["a"]})
+            return SimpleNamespace(content=[text, tool_use])
+
+        schema = {"type": "object", "properties": {"title": {"type": "string"}}}
+        for _ in range(2):
+            service = ClaudeService(config=Settings(anthropic_api_key="test"))
+            service.client = SimpleNamespace(messages=SimpleNamespace(create=create))
+            result = service.generate_structured("prompt", schema, "system")
+            assert result == {"title": "제목", "tags": ["a"]}
+
+        assert len(calls) == 1
+        assert calls[0]["tools"][0]["input_schema"] == schema
+        assert calls[0]["tool_choice"] == {"type": "tool", "name": "respond"}
+
+        service.generate_structured("prompt", {**schema, "required": ["title"]}, "system")
+        assert len(calls) == 2
+
+    def test_missing_tool_call_raises(self, cache_dir):
+        """Test that a reply without the tool call raises a ValueError naming why it stopped."""
+
+        def create(**kwargs):
+            text = SimpleNamespace(type="text", text="")
+            return SimpleNamespace(content=[text], stop_reason="max_tokens")
+
+        service = ClaudeService(config=Settings(anthropic_api_key="test"))
+        service.client = SimpleNamespace(messages=SimpleNamespace(create=create))
+
+        with pytest.raises(ValueError, match="max_tokens"):
+            service.generate_structured("prompt", {"type": "object"})
+        assert list(cache_dir.glob("*.json")) == []
+
+
+class FakeBatches:
+    """Message Batches API that ends after one poll; request "1" errors."""
+
+    def __init__(self):
+        self.requests = []
+        self.submitted = []
+        self.canceled = []
+        self.polls = 0
+
+    def create(self, requests):
+        self.requests = requests
+        self.submitted.append([request["custom_id"] for request in requests])
+        return SimpleNamespace(id="batch_1", processing_status="in_progress")
+
+    def cancel(self, batch_id):
+        self.canceled.append(batch_id)
+
+    def retrieve(self, batch_id):
+        self.polls += 1
+        return SimpleNamespace(id=batch_id, processing_status="ended")
+
+    def results(self, batch_id):
+        for request in reversed(self.requests):
+            custom_id = request["custom_id"]
+            if custom_id == "1":
+                yield SimpleNamespace(custom_id=custom_id, result=SimpleNamespace(type="errored"))
+                continue
+            text = SimpleNamespace(type="text", text=f'{{"id": {custom_id}}}')
+            message = SimpleNamespace(content=[text])
+            result = SimpleNamespace(type="succeeded", message=message)
+            yield SimpleNamespace(custom_id=custom_id, result=result)
+
+
+class TestClaudeBatch:
+    """Tests for Claude Message Batches generation."""
+
+    def test_results_keep_order_and_failures_are_retried(self, monkeypatch):
+        """Test batch results map back by custom_id, with errored requests retried."""
+        monkeypatch.setattr("src.services.ai_service.time.sleep", lambda seconds: None)
+        batches = FakeBatches()
+        service = ClaudeService(config=Settings(anthropic_api_key="test"))
+        service.client = SimpleNamespace(messages=SimpleNamespace(batches=batches))
+        monkeypatch.setattr(
+            service, "generate_stream", lambda prompt, system_prompt: ['{"id": "retry"}']
+        )
+
+        items = [("첫째", "system"), ("둘째", None), ("셋째", None)]
+        results = service.generate_json_batch(items)
+
+        assert results == [{"id": 0}, {"id": "retry"}, {"id": 2}]
+        assert batches.polls == 1
+        assert [request["custom_id"] for request in batches.requests] == ["0", "1", "2"]
+
+        # Every reply was cached, the retried one too, so a rerun submits no batch
+        batches.requests = []
+        assert service.generate_json_batch(items) == results
+        assert batches.requests == []
+
+    def test_requests_are_split_to_fit_batch_limits(self, monkeypatch):
+        """Test that requests beyond the per-batch limit go in another batch."""
+        monkeypatch.setattr("src.services.ai_service.time.sleep", lambda seconds: None)
+        monkeypatch.setattr("src.services.ai_service.MAX_BATCH_REQUESTS", 2)
+        batches = FakeBatches()
+        service = ClaudeService(config=Settings(ai={"cache_enabled": False}))
+        service.client = SimpleNamespace(messages=SimpleNamespace(batches=batches))
+        monkeypatch.setattr(
+            service, "generate_stream", lambda prompt, system_prompt: ['{"id": "retry"}']
+        )
+
+        results = service.generate_json_batch([(str(i), None) for i in range(5)])
+
+        assert results == [{"id": 0}, {"id": "retry"}, {"id": 2}, {"id": 3}, {"id": 4}]
+        assert batches.submitted == [["0", "1"], ["2", "3"], ["4"]]
+
+    def test_batch_not_ended_in_time_is_canceled(self, monkeypatch):
+        """Test that waiting past max_wait_sec cancels the batch and raises."""
+        monkeypatch.setattr("src.services.ai_service.time.sleep", lambda seconds: None)
+        batches = FakeBatches()
+        service = ClaudeService(config=Settings(anthropic_api_key="test"))
+        service.client = SimpleNamespace(messages=SimpleNamespace(batches=batches))
+
+        with pytest.raises(TimeoutError):
+            service.generate_json_batch([("prompt", None)], max_wait_sec=0)
+        assert batches.canceled == ["batch_1"]
+        assert batches.polls == 0
+
+
+class TestGenerateJsonMulti:
+    """Tests for applying one instruction to many items."""
+
+    @staticmethod
+    def service(monkeypatch, respond):
+        """Build an Ollama service whose replies are `respond(prompt)`."""
+        config = Settings(
+            ai={"cache_enabled": False, "ollama": {"max_tokens": 100, "max_context_tokens": 150}}
+        )
+        service = OllamaService(config=config)
+        prompts = []
+
+        def generate_stream(prompt, system_prompt=None):
+            prompts.append(prompt)
+            yield json.dumps(respond(prompt))
+
+        monkeypatch.setattr(service, "generate_stream", generate_stream)
+        return service, prompts
+
+    @staticmethod
+    def items_in(prompt):
+        """Get the lines of a prompt that are items."""
+        return [line for line in prompt.splitlines() if line.startswith("item")]
+
+    def test_items_are_grouped_to_fit_the_context(self, monkeypatch):
+        """Test that items share requests up to the context budget, in order."""
+
+        def respond(prompt):
+            return {"results": [{"item": item} for item in self.items_in(prompt)]}
+
+        service, prompts = self.service(monkeypatch, respond)
+        # Only one 39-token item fits in the 47 tokens left by the response and instruction
+        items = [f"item{i}" + "x" * 74 for i in range(3)]
+
+        results = service.generate_json_multi(items, "요약")
+
+        assert results == [{"item": item} for item in items]
+        assert len(prompts) == 3
+
+        service, prompts = self.service(monkeypatch, respond)
+        results = service.generate_json_multi(["item0", "item1", "item2"], "요약")
+
+        assert results == [{"item": "item0"}, {"item": "item1"}, {"item": "item2"}]
+        assert len(prompts) == 1
+
+    def test_mismatched_results_fall_back_to_one_request_per_item(self, monkeypatch):
+        """Test that a response without one result per item is redone per item."""
+
+        def respond(prompt):
+            if "[1]" in prompt:
+                return {"results": [{"item": "only one"}]}
+            return {"item": self.items_in(prompt)[0]}
+
+        service, prompts = self.service(monkeypatch, respond)
+
+        results = service.generate_json_multi(["item0", "item1"], "요약")
+
+        assert results == [{"item": "item0"}, {"item": "item1"}]
+        assert len(prompts) == 3
+
+
+    def test_top_level_array_falls_back_to_one_request_per_item(self, monkeypatch):
+        """Test that a group answered with a bare JSON array is redone per item."""
+
+        def respond(prompt):
+            if "[1]" in prompt:
+                return [{"item": item} for item in self.items_in(prompt)]
+            return {"item": self.items_in(prompt)[0]}
+
+        service, prompts = self.service(monkeypatch, respond)
+
+        results = service.generate_json_multi(["item0", "item1"], "요약")
+
+        assert results == [{"item": "item0"}, {"item": "item1"}]
+        assert len(prompts) == 3
+
+
+class TestParseJsonResponse:
+    """Tests for recovering JSON from model responses."""
+
+    @pytest.mark.parametrize(
+        "response",
+        [
+            '{"title": "제목", "tags": ["a"]}',
+            '```json\n{"title": "제목", "tags": ["a"]}\n```',
+            'Here you go:\n{"title": "제목", "tags": ["a"]}\nLet me know! {}',
+        ],
+    )
+    def test_recovers_object(self, response):
+        """Test clean, fenced, and surrounded JSON objects."""
+        assert _parse_json_response(response) == {"title": "제목", "tags": ["a"]}
+
+    def test_braces_inside_strings(self):
+        """Test that braces in string values don't end the object early."""
+        assert _parse_json_response('결과: {"text": "a } b \\" {"} 끝') == {"text": 'a } b " {'}
+
+    def test_unparseable_response_raises(self):
+        """Test that a response without a JSON object raises ValueError."""
+        with pytest.raises(ValueError, match="Could not parse JSON"):
+            _parse_json_response("죄송합니다, 생성할 수 없습니다.")
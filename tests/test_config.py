@@ -0,0 +1,62 @@
+"""Tests for configuration loading."""
+
+import os
+import tempfile
+from dataclasses import FrozenInstanceError
+from pathlib import Path
+
+import pytest
+
+from src.config import PresentationSettings, Settings, get_settings
+
+
+class TestSettings:
+    """Tests for settings loading."""
+
+    def test_from_yaml_overrides_defaults(self):
+        """Test loading settings from a YAML file."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config_path = Path(tmpdir) / "config.yaml"
+            config_path.write_text('tts:\n  provider: "local"\n', encoding="utf-8")
+
+            config = Settings.from_yaml(config_path)
+            assert config.tts.provider == "local"
+            assert config.video.fps == 30
+
+    def test_from_yaml_missing_file_uses_defaults(self):
+        """Test that a missing YAML file falls back to defaults."""
+        config = Settings.from_yaml("/nonexistent/config.yaml")
+        assert config.presentation.width == 1920
+
+    def test_get_settings_is_cached(self):
+        """Test that repeated loads of the same file share one instance."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config_path = Path(tmpdir) / "config.yaml"
+            config_path.write_text('ai:\n  provider: "openai"\n', encoding="utf-8")
+
+            assert get_settings(config_path) is get_settings(str(config_path))
+
+    def test_get_settings_reloads_on_change(self):
+        """Test that editing the config file invalidates the cache."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config_path = Path(tmpdir) / "config.yaml"
+            config_path.write_text('ai:\n  provider: "openai"\n', encoding="utf-8")
+            first = get_settings(config_path)
+
+            config_path.write_text('ai:\n  provider: "ollama"\n', encoding="utf-8")
+            stat = config_path.stat()
+            os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+            second = get_settings(config_path)
+            assert first.ai.provider == "openai"
+            assert second.ai.provider == "ollama"
+
+    def test_nested_settings_are_coerced_from_dicts(self):
+        """Test that nested YAML mappings become frozen settings groups."""
+        config = Settings(presentation={"width": 1280, "title_color": "#000000"})
+        assert isinstance(config.presentation, PresentationSettings)
+        assert config.presentation.width == 1280
+        assert config.presentation.height == 1080
+
+        with pytest.raises(FrozenInstanceError):
+            config.presentation.width = 640
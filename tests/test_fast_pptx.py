@@ -0,0 +1,53 @@
+"""Tests for the direct PPTX writer."""
+
+import tempfile
+from pathlib import Path
+
+from pptx import Presentation as PPTXPresentation
+
+from src.generators.fast_pptx import (
+    FastPresentation,
+    inches_to_emu,
+    paragraph_xml,
+    px_to_emu,
+    textbox_xml,
+)
+
+
+class TestFastPresentation:
+    """Tests for FastPresentation output."""
+
+    def test_output_is_readable_by_python_pptx(self):
+        """Test that slides, text, formatting and notes round-trip."""
+        prs = FastPresentation(width=px_to_emu(1920), height=px_to_emu(1080))
+        prs.add_slide(
+            [
+                textbox_xml(
+                    2,
+                    inches_to_emu(0.5),
+                    inches_to_emu(0.5),
+                    inches_to_emu(10),
+                    inches_to_emu(1),
+                    [paragraph_xml("제목 <&>", size_pt=44, color="#1a1a2e", bold=True)],
+                )
+            ],
+            notes="발표자 노트",
+        )
+        prs.add_slide([])
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "test.pptx"
+            prs.save(path)
+            loaded = PPTXPresentation(str(path))
+
+            assert loaded.slide_width == px_to_emu(1920)
+            assert len(loaded.slides) == 2
+
+            first = loaded.slides[0]
+            run = first.shapes[0].text_frame.paragraphs[0].runs[0]
+            assert run.text == "제목 <&>"
+            assert run.font.size.pt == 44
+            assert run.font.bold is True
+            assert str(run.font.color.rgb) == "1A1A2E"
+            assert first.notes_slide.notes_text_frame.text == "발표자 노트"
+            assert not loaded.slides[1].has_notes_slide
@@ -0,0 +1,29 @@
+"""Tests for ffmpeg helpers."""
+
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from src.utils.ffmpeg import concat_entry, probe_duration, run_ffmpeg
+
+
+class TestFFmpegHelpers:
+    """Tests for ffmpeg helper functions."""
+
+    def test_concat_entry_escapes_quotes(self):
+        """Test that single quotes in paths are escaped for the concat demuxer."""
+        assert concat_entry(Path("/tmp/it's.png")) == "file '/tmp/it'\\''s.png'"
+
+    def test_probe_duration(self):
+        """Test reading the duration of a generated audio file."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            audio_path = Path(tmpdir) / "tone.wav"
+            run_ffmpeg("-f", "lavfi", "-i", "sine=duration=1.5", audio_path)
+
+            assert probe_duration(audio_path) == pytest.approx(1.5, abs=0.05)
+
+    def test_run_ffmpeg_raises_on_failure(self):
+        """Test that ffmpeg errors surface as RuntimeError."""
+        with pytest.raises(RuntimeError, match="ffmpeg failed"):
+            run_ffmpeg("-i", "/nonexistent/input.wav", "/nonexistent/output.wav")
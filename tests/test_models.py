@@ -1,8 +1,11 @@
 """Tests for data models."""
 
+import numpy as np
 import pytest
-from src.models.script import Script, ScriptSection, ScriptInput
+
 from src.models.presentation import Presentation, Slide, SyncData, SyncInfo
+from src.models.script import Script, ScriptInput, ScriptSection
+from src.utils.helpers import estimate_speech_duration
 
 
 class TestScriptModels:
@@ -54,6 +57,32 @@ class TestScriptModels:
         assert total == 90.0
         assert script.total_duration_sec == 90.0
 
+    def test_script_section_duration_is_estimated_when_not_given(self):
+        """Test that a section without a duration, built or loaded, gets an estimate."""
+        section = ScriptSection(section_id=1, title="인트로", content="안녕하세요 " * 20)
+        loaded = Script.model_validate(
+            {"title": "테스트", "sections": [{"section_id": 1, "title": "인트로", "content": ""}]}
+        )
+
+        assert section.estimated_duration_sec == estimate_speech_duration(section.content)
+        assert section.estimated_duration_sec > 0
+        assert loaded.sections[0].estimated_duration_sec == estimate_speech_duration("")
+
+    def test_script_json_round_trip(self):
+        """Test that a script survives the CLI's JSON save and load."""
+        script = Script(
+            title="테스트 스크립트",
+            sections=[ScriptSection(section_id=1, title="인트로", content="안녕하세요")],
+            tags=["교육"],
+        )
+
+        data = script.model_dump_json(indent=2)
+        loaded = Script.model_validate_json(data.encode("utf-8"))
+
+        assert "안녕하세요" in data  # Written as UTF-8, not \u escapes
+        assert loaded == script
+        assert loaded.total_duration_sec == script.total_duration_sec
+
     def test_script_to_full_text(self):
         """Test converting script to full text."""
         sections = [
@@ -81,6 +110,37 @@ class TestScriptModels:
         missing = script.get_section_by_id(999)
         assert missing is None
 
+    def test_script_get_section_by_id_after_append(self):
+        """Test that lookups see sections added after an earlier lookup."""
+        script = Script(
+            title="테스트",
+            sections=[ScriptSection(section_id=1, title="A", content="내용 A")],
+        )
+        assert script.get_section_by_id(2) is None
+
+        script.sections.append(ScriptSection(section_id=2, title="B", content="내용 B"))
+        assert script.get_section_by_id(2).title == "B"
+
+    def test_script_get_section_by_id_after_mutation(self):
+        """Test that lookups see sections replaced or re-numbered in place once marked."""
+        script = Script(
+            title="테스트",
+            sections=[
+                ScriptSection(section_id=1, title="A", content="내용 A"),
+                ScriptSection(section_id=2, title="B", content="내용 B"),
+            ],
+        )
+        assert script.get_section_by_id(1).title == "A"
+
+        script.sections[0] = ScriptSection(section_id=1, title="A2", content="내용 A")
+        script.sections[1].section_id = 5
+        assert script.get_section_by_id(1).title == "A"  # Indexed until marked changed
+
+        script.mark_changed()
+        assert script.get_section_by_id(1).title == "A2"
+        assert script.get_section_by_id(5).title == "B"
+        assert script.get_section_by_id(2) is None
+
 
 class TestPresentationModels:
     """Tests for presentation models."""
@@ -98,10 +158,7 @@ class TestPresentationModels:
 
     def test_presentation_creation(self):
         """Test creating a Presentation."""
-        slides = [
-            Slide(slide_index=i, title=f"슬라이드 {i}")
-            for i in range(5)
-        ]
+        slides = [Slide(slide_index=i, title=f"슬라이드 {i}") for i in range(5)]
         presentation = Presentation(title="테스트 프레젠테이션", slides=slides)
 
         assert presentation.get_slide_count() == 5
@@ -128,6 +185,91 @@ class TestPresentationModels:
         total = sync_data.calculate_total_duration()
         assert total == 90.0
 
+    def test_sync_data_timeline_arrays(self):
+        """Test that start/end arrays follow appends and marked in-place timing edits."""
+        sync_data = SyncData(
+            sync_items=[SyncInfo(slide_index=0, section_id=1, start_time=0.0, end_time=30.0)]
+        )
+        assert sync_data.end_times.tolist() == [30.0]
+
+        sync_data.sync_items.append(
+            SyncInfo(slide_index=1, section_id=2, start_time=30.0, end_time=45.0)
+        )
+        assert sync_data.start_times.tolist() == [0.0, 30.0]
+
+        sync_data.sync_items[1].end_time = 50.0
+        sync_data.mark_changed()
+        assert sync_data.calculate_total_duration() == 50.0
+        assert sync_data.end_times.tolist() == [30.0, 50.0]
+
+    @pytest.mark.parametrize(
+        "spans",
+        [
+            [(0.0, 3.0), (3.0, 3.0), (3.0, 8.0), (10.0, 12.0)],  # Gap and empty item
+            [(0.0, 10.0), (2.0, 3.0), (4.0, 6.0)],  # Overlapping items
+            [(5.0, 8.0), (0.0, 5.0)],  # Out of order
+            [(10.0, 12.0), (3.0, 3.0), (0.0, 3.0), (3.0, 8.0)],  # Out of order with a gap
+        ],
+    )
+    def test_sync_data_item_at_time_matches_linear_scan(self, spans):
+        """Test that the array lookup finds the first item covering each time."""
+        sync_data = SyncData(
+            sync_items=[
+                SyncInfo(slide_index=i, section_id=i, start_time=start, end_time=end)
+                for i, (start, end) in enumerate(spans)
+            ]
+        )
+
+        for time in [-1.0, 0.0, 2.5, 3.0, 5.0, 7.99, 8.0, 9.0, 10.0, 11.0, 12.0]:
+            expected = next(
+                (item for item in sync_data.sync_items if item.start_time <= time < item.end_time),
+                None,
+            )
+            assert sync_data.item_at_time(time) is expected
+
+    def test_sync_data_repeated_lookups_reuse_sorted_view(self, monkeypatch):
+        """Test that lookups sort items once, and again only after a change."""
+        sorts = []
+        argsort = np.argsort
+        monkeypatch.setattr(np, "argsort", lambda *a, **kw: sorts.append(1) or argsort(*a, **kw))
+        sync_data = SyncData(
+            sync_items=[
+                SyncInfo(slide_index=i, section_id=i, start_time=float(i), end_time=i + 1.0)
+                for i in reversed(range(5))
+            ]
+        )
+
+        for time in [0.5, 1.5, 2.5, 3.5, 4.5, 9.0]:
+            sync_data.item_at_time(time)
+        assert sync_data.end_times.tolist() == [5.0, 4.0, 3.0, 2.0, 1.0]
+        assert len(sorts) == 1
+
+        sync_data.mark_changed()
+        assert sync_data.item_at_time(0.5).slide_index == 0
+        assert len(sorts) == 2
+
+    def test_sync_data_item_at_time_after_editing_times(self):
+        """Test that lookups see items edited in place once marked changed."""
+        sync_data = SyncData(
+            sync_items=[
+                SyncInfo(slide_index=0, section_id=0, start_time=0.0, end_time=5.0),
+                SyncInfo(slide_index=1, section_id=1, start_time=5.0, end_time=10.0),
+            ]
+        )
+        assert sync_data.item_at_time(7.0).slide_index == 1
+
+        sync_data.sync_items[0].end_time = 8.0
+        sync_data.sync_items[1].start_time = 8.0
+        sync_data.mark_changed()
+        assert sync_data.item_at_time(7.0).slide_index == 0
+
+        sync_data.sync_items = [
+            sync_data.sync_items[0],
+            SyncInfo(slide_index=2, section_id=2, start_time=8.0, end_time=9.0),
+        ]
+        assert sync_data.item_at_time(8.5).slide_index == 2
+        assert sync_data.item_at_time(9.5) is None
+
     def test_sync_data_get_sync_for_slide(self):
         """Test getting sync info for a specific slide."""
         sync_items = [
@@ -142,3 +284,8 @@ class TestPresentationModels:
 
         missing = sync_data.get_sync_for_slide(99)
         assert missing is None
+
+        sync_data.sync_items[1].slide_index = 5
+        sync_data.mark_changed()
+        assert sync_data.get_sync_for_slide(1) is None
+        assert sync_data.get_sync_for_slide(5).section_id == 2
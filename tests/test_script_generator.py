@@ -0,0 +1,105 @@
+"""Tests for the script generator."""
+
+import threading
+import time
+
+from src.config import Settings
+from src.generators.script_generator import ScriptGenerator
+from src.models.script import ScriptSection
+from src.services.ai_service import AIService
+
+
+class FakeAIService(AIService):
+    """AI service returning canned responses without network access."""
+
+    def __init__(self, response: dict | None = None):
+        self.response = response or {}
+        self.thread_ids: set[int] = set()
+
+    def generate(self, prompt: str, system_prompt: str | None = None) -> str:
+        return ""
+
+    def generate_json(self, prompt: str, system_prompt: str | None = None) -> dict:
+        self.thread_ids.add(threading.get_ident())
+        if "개선 지시" in prompt:
+            title = prompt.split("제목: ", 1)[1].split("\n", 1)[0]
+            return {"title": f"{title} (개선)", "content": "개선된 대본 내용입니다."}
+        return self.response
+
+
+def make_generator(ai_service: AIService) -> ScriptGenerator:
+    """Create a generator that doesn't load settings from disk."""
+    return ScriptGenerator(ai_service=ai_service, config=Settings())
+
+
+class TestScriptGenerator:
+    """Tests for ScriptGenerator."""
+
+    def test_enhance_sections_preserves_order(self):
+        """Test that concurrent enhancement returns sections in input order."""
+        sections = [
+            ScriptSection(section_id=i, title=f"섹션 {i}", content="원래 내용") for i in range(1, 5)
+        ]
+        ai_service = FakeAIService()
+
+        enhanced = make_generator(ai_service).enhance_sections(sections, "더 쉽게")
+
+        assert [s.section_id for s in enhanced] == [1, 2, 3, 4]
+        assert [s.title for s in enhanced] == [f"섹션 {i} (개선)" for i in range(1, 5)]
+        assert all(s.estimated_duration_sec > 0 for s in enhanced)
+
+    def test_enhance_sections_empty(self):
+        """Test that enhancing no sections makes no AI calls."""
+        ai_service = FakeAIService()
+        assert make_generator(ai_service).enhance_sections([], "더 쉽게") == []
+        assert ai_service.thread_ids == set()
+
+    def test_generate_validates_response(self):
+        """Test that the AI response is validated into a timed Script."""
+        ai_service = FakeAIService(
+            {
+                "description": "설명",
+                "sections": [
+                    {"section_id": 1, "title": "인트로", "content": "안녕하세요 여러분"},
+                    {"section_id": 2, "title": "본론", "content": "오늘의 주제는 이것입니다"},
+                ],
+                "tags": ["교육"],
+            }
+        )
+
+        script = make_generator(ai_service).generate_from_dict(
+            {"topic": "테스트 주제", "storyline": "스토리"}
+        )
+
+        assert script.title == "테스트 주제"
+        assert [s.title for s in script.sections] == ["인트로", "본론"]
+        assert all(s.estimated_duration_sec > 0 for s in script.sections)
+        assert script.total_duration_sec == sum(s.estimated_duration_sec for s in script.sections)
+
+    def test_enhance_sections_respects_max_in_flight(self):
+        """Test that concurrent requests never exceed the configured cap."""
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+
+        class SlowAIService(FakeAIService):
+            def generate_json(self, prompt, system_prompt=None):
+                nonlocal active, peak
+                with lock:
+                    active += 1
+                    peak = max(peak, active)
+                time.sleep(0.02)
+                with lock:
+                    active -= 1
+                return super().generate_json(prompt, system_prompt)
+
+        ai_service = SlowAIService()
+        ai_service._in_flight = threading.Semaphore(2)
+        sections = [
+            ScriptSection(section_id=i, title=f"섹션 {i}", content="내용") for i in range(6)
+        ]
+
+        enhanced = make_generator(ai_service).enhance_sections(sections, "더 쉽게")
+
+        assert [s.section_id for s in enhanced] == list(range(6))
+        assert peak == 2
@@ -0,0 +1,98 @@
+"""Tests for the sync service."""
+
+from pathlib import Path
+
+import pytest
+
+from src.models.presentation import Presentation, Slide
+from src.models.script import Script, ScriptSection
+from src.services.sync_service import SyncService
+
+
+def _spans(sync_data):
+    return [(item.start_time, item.end_time) for item in sync_data.sync_items]
+
+
+class TestSyncService:
+    """Tests for SyncService timing."""
+
+    def test_create_sync_data_with_title_slide(self):
+        """Test that a title intro precedes sections laid out back to back."""
+        script = Script(
+            title="테스트",
+            sections=[
+                ScriptSection(section_id=1, title="A", content="", estimated_duration_sec=2.5),
+                ScriptSection(section_id=2, title="B", content="", estimated_duration_sec=4.0),
+            ],
+        )
+        presentation = Presentation(
+            title="테스트", slides=[Slide(slide_index=i, title=str(i)) for i in range(3)]
+        )
+        audio = Path("section_1.mp3")
+
+        sync_data = SyncService().create_sync_data(script, presentation, [(1, audio, 5.0)])
+
+        assert _spans(sync_data) == [(0.0, 3.0), (3.0, 8.0), (8.0, 12.0)]
+        assert [item.slide_index for item in sync_data.sync_items] == [0, 1, 2]
+        assert [item.audio_file for item in sync_data.sync_items] == [None, audio, None]
+        assert sync_data.total_duration == 12.0
+
+    def test_create_sync_data_drops_sections_without_slides(self):
+        """Test that sections beyond the last slide get no sync item."""
+        script = Script(
+            title="테스트",
+            sections=[
+                ScriptSection(section_id=i, title=str(i), content="", estimated_duration_sec=1.0)
+                for i in range(1, 4)
+            ],
+        )
+        presentation = Presentation(
+            title="테스트", slides=[Slide(slide_index=i, title=str(i)) for i in range(2)]
+        )
+
+        sync_data = SyncService().create_sync_data(script, presentation, [])
+
+        assert [item.section_id for item in sync_data.sync_items] == [1, 2]
+        assert _spans(sync_data) == [(0.0, 1.0), (1.0, 2.0)]
+
+    def test_create_simple_sync(self):
+        """Test that slides play one after another for the given durations."""
+        presentation = Presentation(
+            title="테스트", slides=[Slide(slide_index=i, title=str(i)) for i in range(3)]
+        )
+
+        sync_data = SyncService().create_simple_sync(presentation, [0.1, 0.2, 0.3])
+
+        assert _spans(sync_data) == [(0.0, 0.1), (0.1, 0.1 + 0.2), (0.1 + 0.2, 0.1 + 0.2 + 0.3)]
+        with pytest.raises(ValueError):
+            SyncService().create_simple_sync(presentation, [1.0])
+
+    def test_adjust_timing(self):
+        """Test that actual durations replace estimates and later items shift."""
+        presentation = Presentation(
+            title="테스트", slides=[Slide(slide_index=i, title=str(i)) for i in range(3)]
+        )
+        service = SyncService()
+        sync_data = service.create_simple_sync(presentation, [1.0, 2.0, 3.0])
+
+        service.adjust_timing(sync_data, {1: 5.0})
+
+        assert _spans(sync_data) == [(0.0, 1.0), (1.0, 6.0), (6.0, 9.0)]
+        assert sync_data.total_duration == 9.0
+        assert service.get_slide_at_time(sync_data, 6.5) == 2
+
+    def test_adjust_timing_maps_durations_by_section(self):
+        """Test that durations apply by section ID, in any order, with others kept."""
+        presentation = Presentation(
+            title="테스트", slides=[Slide(slide_index=i, title=str(i)) for i in range(4)]
+        )
+        service = SyncService()
+        sync_data = service.create_simple_sync(presentation, [1.0, 1.0, 1.0, 1.0])
+        sync_data.sync_items[0].end_time = 2.0  # Edited in place
+        sync_data.mark_changed()
+
+        service.adjust_timing(sync_data, {3: 4.0, 99: 7.0, 1: 3.0})
+
+        assert _spans(sync_data) == [(0.0, 2.0), (2.0, 5.0), (5.0, 6.0), (6.0, 10.0)]
+        assert sync_data.section_ids.tolist() == [0, 1, 2, 3]
+        assert sync_data.slide_indices.tolist() == [0, 1, 2, 3]
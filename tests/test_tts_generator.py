@@ -0,0 +1,102 @@
+"""Tests for the TTS generator."""
+
+import threading
+import time
+from concurrent.futures import CancelledError
+
+import httpx
+import pytest
+
+from src.config import Settings
+from src.generators.tts_generator import TTSGenerator
+from src.models.script import Script, ScriptSection
+
+
+class TestTTSGenerator:
+    """Tests for TTSGenerator."""
+
+    def test_connections_are_closed_when_synthesis_fails(self):
+        """Test that leaving the generator's context closes the provider's HTTP client."""
+        with pytest.raises(RuntimeError):
+            with TTSGenerator(config=Settings(), provider="openai") as generator:
+                http_client = generator.provider.http_client
+                raise RuntimeError("synthesis failed")
+
+        assert http_client.is_closed
+        assert "http_client" not in generator.provider.__dict__
+
+    def test_close_without_requests_is_a_no_op(self):
+        """Test closing providers that never opened a connection."""
+        for provider in ("openai", "elevenlabs", "google", "local"):
+            TTSGenerator(config=Settings(), provider=provider).close()
+
+    def test_concurrent_sections_share_one_client(self, tmp_path, monkeypatch):
+        """Test that the HTTP client is built once, before sections fan out to threads."""
+        built = []
+
+        def keepalive_http_client(**kwargs):
+            time.sleep(0.01)  # Widen the window for threads racing to build a client
+            built.append(kwargs)
+            return httpx.Client()
+
+        monkeypatch.setattr(
+            "src.generators.tts_generator.keepalive_http_client", keepalive_http_client
+        )
+        generator = TTSGenerator(config=Settings(openai_api_key="test"), provider="openai")
+
+        def synthesize(text, output_path):
+            assert generator.provider.client is not None
+            return 1.0
+
+        monkeypatch.setattr(generator.provider, "synthesize", synthesize)
+        script = Script(
+            title="테스트",
+            sections=[ScriptSection(section_id=i, title="", content="내용") for i in range(8)],
+        )
+
+        with generator:
+            generator.generate_for_script(script, tmp_path)
+        assert len(built) == 1
+
+    def test_cancel_stops_sections_not_yet_started(self, tmp_path, monkeypatch):
+        """Test that setting the cancel event stops synthesis with CancelledError."""
+        cancel = threading.Event()
+        synthesized = []
+
+        def generate_for_section(section, output_dir=None):
+            synthesized.append(section.section_id)
+            cancel.set()
+            return tmp_path / f"{section.section_id}.wav", 1.0
+
+        generator = TTSGenerator(config=Settings(), provider="local")
+        monkeypatch.setattr(generator, "generate_for_section", generate_for_section)
+        script = Script(
+            title="테스트",
+            sections=[ScriptSection(section_id=i, title="", content="내용") for i in range(3)],
+        )
+
+        with pytest.raises(CancelledError):
+            generator.generate_for_script(script, tmp_path, cancel=cancel)
+        assert synthesized == [0]
+
+    def test_cancel_stops_ssml_batches_not_yet_sent(self, tmp_path, monkeypatch):
+        """Test that Google's batched synthesis checks the cancel event per request."""
+        cancel = threading.Event()
+        sent = []
+
+        def synthesize_ssml_batch(batch):
+            sent.append(len(batch))
+            cancel.set()
+            return [1.0] * len(batch)
+
+        generator = TTSGenerator(config=Settings(), provider="google")
+        monkeypatch.setattr(generator.provider, "_synthesize_ssml_batch", synthesize_ssml_batch)
+        # Each section fills about half an SSML request, so they go two at a time
+        script = Script(
+            title="테스트",
+            sections=[ScriptSection(section_id=i, title="", content="가" * 800) for i in range(6)],
+        )
+
+        with pytest.raises(CancelledError):
+            generator.generate_for_script(script, tmp_path, cancel=cancel)
+        assert sent == [2]
@@ -1,15 +1,16 @@
 """Tests for utility functions."""
 
-import pytest
-from pathlib import Path
 import tempfile
+from pathlib import Path
+
+import pytest
 
 from src.utils.helpers import (
     ensure_dir,
+    estimate_speech_duration,
+    format_duration,
     get_timestamp,
     sanitize_filename,
-    format_duration,
-    estimate_speech_duration,
 )
 
 
@@ -30,6 +31,25 @@ class TestHelpers:
             result = ensure_dir(tmpdir)
             assert result.exists()
 
+    def test_ensure_dir_creates_each_path_once(self, tmp_path, monkeypatch):
+        """Test that repeated calls for the same path skip mkdir."""
+        calls = []
+        mkdir = Path.mkdir
+
+        def counting_mkdir(self, *args, **kwargs):
+            calls.append(self)
+            mkdir(self, *args, **kwargs)
+
+        monkeypatch.setattr(Path, "mkdir", counting_mkdir)
+
+        for _ in range(3):
+            ensure_dir(tmp_path / "videos")
+
+        assert calls == [tmp_path / "videos"]
+
+        ensure_dir(tmp_path)
+        assert calls == [tmp_path / "videos"]  # Already exists
+
     def test_get_timestamp_format(self):
         """Test timestamp format."""
         timestamp = get_timestamp()
@@ -84,3 +104,13 @@ class TestHelpers:
         mixed_text = "안녕하세요 Hello 반갑습니다 World"
         duration = estimate_speech_duration(mixed_text)
         assert duration > 0
+
+    def test_estimate_speech_duration_long_text(self):
+        """Test that long texts count Hangul syllables and ASCII words like short ones."""
+        piece = "Python과 machine-learning으로 AI를 배워요! ÀB z_Z `@[ "
+        text = piece * 20
+        assert len(piece) < 200 <= len(text)
+
+        # 7 Hangul syllables and 7 English words (Python, machine, learning, AI, B, z, Z)
+        assert estimate_speech_duration(piece) == pytest.approx(7 / 8 + 7 / 2.5)
+        assert estimate_speech_duration(text) == pytest.approx(20 * (7 / 8 + 7 / 2.5))
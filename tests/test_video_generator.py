@@ -0,0 +1,158 @@
+"""Tests for the video generator."""
+
+import array
+import subprocess
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from src.config import Settings
+from src.generators.video_generator import VideoGenerator, detect_hw_encoder
+from src.models.presentation import Presentation, Slide, SyncData, SyncInfo
+from src.utils.ffmpeg import get_ffmpeg_exe, probe_duration, run_ffmpeg
+
+
+def peak_amplitude(video_path: Path, start: float, duration: float) -> int:
+    """Decode a window of a video's audio track and return its peak sample."""
+    result = subprocess.run(
+        [
+            get_ffmpeg_exe(),
+            "-v",
+            "error",
+            "-ss",
+            str(start),
+            "-t",
+            str(duration),
+            "-i",
+            str(video_path),
+            "-vn",
+            "-f",
+            "s16le",
+            "-ac",
+            "1",
+            "-",
+        ],
+        capture_output=True,
+        check=True,
+    )
+    samples = array.array("h", result.stdout)
+    return max((abs(s) for s in samples), default=0)
+
+
+class TestVideoGenerator:
+    """Tests for VideoGenerator."""
+
+    @pytest.fixture
+    def deck(self, tmp_path):
+        """Two 1-second slides; the first slide's audio runs 3 seconds too long."""
+        slides = []
+        for i in range(2):
+            image_path = tmp_path / f"slide_{i}.png"
+            Image.new("RGB", (64, 36), color=(i * 200, 0, 0)).save(image_path)
+            slides.append(Slide(slide_index=i, title=f"S{i}", image_path=image_path))
+
+        loud = tmp_path / "loud.wav"
+        quiet = tmp_path / "quiet.wav"
+        run_ffmpeg("-f", "lavfi", "-i", "sine=frequency=440:duration=4", loud)
+        run_ffmpeg("-f", "lavfi", "-i", "anullsrc=r=44100:cl=mono", "-t", "1", quiet)
+
+        sync_data = SyncData(
+            sync_items=[
+                SyncInfo(slide_index=0, section_id=1, start_time=0, end_time=1, audio_file=loud),
+                SyncInfo(slide_index=1, section_id=2, start_time=1, end_time=2, audio_file=quiet),
+            ]
+        )
+        presentation = Presentation(title="테스트", slides=slides)
+        return presentation, sync_data
+
+    @pytest.mark.parametrize("transitions", [False, True])
+    def test_section_audio_is_cut_to_slide_duration(self, deck, tmp_path, transitions):
+        """Test that over-long section audio doesn't spill into the next slide."""
+        presentation, sync_data = deck
+        config = Settings(video={"width": 64, "height": 36, "fps": 10, "hwaccel": "none"})
+        generator = VideoGenerator(config=config)
+        generate = generator.generate_with_transitions if transitions else generator.generate
+
+        output_path = generate(presentation, sync_data, tmp_path / "out.mp4")
+
+        assert probe_duration(output_path) == pytest.approx(2.0, abs=0.1)
+        assert peak_amplitude(output_path, 0.2, 0.6) > 1000
+        assert peak_amplitude(output_path, 1.2, 0.6) < 100
+
+    def test_concat_list_holds_each_slide_for_its_duration(self, tmp_path):
+        """Test the concat demuxer list, including the repeated final entry."""
+        tmp_path = tmp_path.resolve()
+        generator = VideoGenerator(config=Settings(video={"hwaccel": "none"}))
+        slides = [(tmp_path / "a.png", 1.5), (tmp_path / "b.png", 2.0)]
+
+        inputs = generator._concat_demuxer_inputs(slides, tmp_path)
+
+        assert inputs[:4] == ["-f", "concat", "-safe", "0"]
+        assert inputs[-1].read_text(encoding="utf-8").splitlines() == [
+            f"file '{tmp_path / 'a.png'}'",
+            "duration 1.500",
+            f"file '{tmp_path / 'b.png'}'",
+            "duration 2.000",
+            f"file '{tmp_path / 'b.png'}'",
+        ]
+
+    def test_xfade_offsets_follow_slide_start_times(self):
+        """Test that each crossfade starts where the next slide starts."""
+        generator = VideoGenerator(config=Settings(video={"hwaccel": "none"}))
+
+        graph = generator._xfade_filter([2.0, 3.0, 1.0], 0.5, scale=False)
+
+        assert "scale=" not in graph
+        assert "[s0][s1]xfade=transition=fade:duration=0.500:offset=2.000[x1]" in graph
+        assert "[x1][s2]xfade=transition=fade:duration=0.500:offset=5.000[x2]" in graph
+        assert "tpad=stop_mode=clone:stop_duration=2.500" in graph
+        assert graph.endswith("[x2]null[vout]")
+
+    def test_vaapi_frames_are_uploaded_to_the_device(self, monkeypatch):
+        """Test that a detected VAAPI encoder gets its device and upload filter."""
+        monkeypatch.setattr(
+            "src.generators.video_generator.can_encode",
+            lambda codec, *args: codec == "h264_vaapi",
+        )
+        detect_hw_encoder.cache_clear()
+        try:
+            generator = VideoGenerator(config=Settings(video={"hwaccel": "auto"}))
+        finally:
+            detect_hw_encoder.cache_clear()
+
+        output_args = generator._video_output_args()
+        graph = generator._xfade_filter([1.0, 1.0], 0.5, scale=False)
+
+        assert output_args[:2] == ["-c:v", "h264_vaapi"]
+        assert "-preset" not in output_args
+        assert "-pix_fmt" not in output_args
+        assert generator._codec_args["device_args"][0] == "-vaapi_device"
+        assert graph.endswith("[x1]format=nv12,hwupload[vout]")
+
+    def test_plain_generate_runs_no_filters(self, deck, tmp_path, monkeypatch):
+        """Test that slides already at the video size go straight from demuxer to encoder."""
+        presentation, sync_data = deck
+        config = Settings(video={"width": 64, "height": 36, "fps": 10, "hwaccel": "none"})
+        calls = []
+        monkeypatch.setattr(
+            "src.generators.video_generator.run_ffmpeg", lambda *args: calls.append(args)
+        )
+
+        VideoGenerator(config=config).generate(presentation, sync_data, tmp_path / "out.mp4")
+
+        (args,) = calls
+        assert "concat" in args
+        assert "-vf" not in args
+        assert "-filter_complex" not in args
+
+    def test_gpu_xfade_blends_on_the_device(self):
+        """Test that the GPU path uploads slides and downloads the blended result."""
+        generator = VideoGenerator(config=Settings(video={"hwaccel": "none"}))
+        generator._gpu_xfade = True
+
+        graph = generator._xfade_filter([2.0, 3.0], 0.5, scale=False)
+
+        assert "trim=duration=2.500,hwupload[s0]" in graph
+        assert "[s0][s1]xfade_opencl=transition=fade:duration=0.500:offset=2.000[x1]" in graph
+        assert graph.endswith("[x1]hwdownload,format=yuv420p[vout]")
@@ -0,0 +1,175 @@
+"""Tests for the YouTube upload service."""
+
+import json
+import os
+from types import SimpleNamespace
+
+import pytest
+from googleapiclient.http import MediaUploadProgress
+
+from src.config import Settings
+from src.services import youtube_service
+from src.services.youtube_service import (
+    UPLOAD_CHUNK_ALIGNMENT,
+    UPLOAD_NUM_RETRIES,
+    YouTubeService,
+)
+
+
+class FakeInsertRequest:
+    """Resumable insert request that sends the file in fixed-size chunks."""
+
+    def __init__(self, media_body, **kwargs):
+        self.media = media_body
+        self.sent = 0
+        self.retries = []
+
+    def next_chunk(self, num_retries=0):
+        self.retries.append(num_retries)
+        self.sent = min(self.sent + self.media.chunksize(), self.media.size())
+        if self.sent < self.media.size():
+            return MediaUploadProgress(self.sent, self.media.size()), None
+        return None, {"id": "abc123"}
+
+
+class FakeYouTube:
+    """Stand-in for the YouTube API client."""
+
+    def __init__(self):
+        self.request = None
+
+    def videos(self):
+        return self
+
+    def insert(self, **kwargs):
+        self.request = FakeInsertRequest(**kwargs)
+        return self.request
+
+
+class FakeThumbnails:
+    """Stand-in for the thumbnails resource, recording what is set."""
+
+    def __init__(self):
+        self.calls = []
+
+    def set(self, **kwargs):
+        self.calls.append((kwargs["videoId"], kwargs["media_body"]))
+        return SimpleNamespace(execute=lambda: {})
+
+
+class TestYouTubeService:
+    """Tests for YouTubeService."""
+
+    def test_iter_upload_reports_chunk_progress(self, tmp_path):
+        """Test that progress is reported per chunk and the video ID is returned."""
+        chunk_size = UPLOAD_CHUNK_ALIGNMENT * 2
+        video_path = tmp_path / "video.mp4"
+        video_path.write_bytes(b"\0" * (chunk_size * 2 + 1))
+        service = YouTubeService(config=Settings(youtube={"chunk_size": chunk_size}))
+        service._service = FakeYouTube()
+
+        chunks = service.iter_upload(video_path, "제목", "설명")
+        progress = []
+        while True:
+            try:
+                progress.append(next(chunks))
+            except StopIteration as done:
+                video_id = done.value
+                break
+
+        total = chunk_size * 2 + 1
+        assert video_id == "abc123"
+        assert progress == [
+            (chunk_size, total),
+            (chunk_size * 2, total),
+            (total, total),
+        ]
+        assert service._service.request.retries == [UPLOAD_NUM_RETRIES] * 3
+
+    def test_missing_thumbnail_fails_before_uploading(self, tmp_path):
+        """Test that a missing thumbnail is reported before any video bytes are sent."""
+        video_path = tmp_path / "video.mp4"
+        video_path.write_bytes(b"\0")
+        service = YouTubeService(config=Settings())
+        service._service = FakeYouTube()
+
+        with pytest.raises(FileNotFoundError, match="Thumbnail"):
+            next(service.iter_upload(video_path, "제목", "설명", thumbnail_path=tmp_path / "x.png"))
+        assert service._service.request is None
+
+    def test_upload_chunk_size_is_aligned(self):
+        """Test that the configured chunk size is rounded down to 256 KiB multiples."""
+        for configured, expected in [
+            (8 * 1024 * 1024, 8 * 1024 * 1024),
+            (UPLOAD_CHUNK_ALIGNMENT * 3 + 1000, UPLOAD_CHUNK_ALIGNMENT * 3),
+            (1000, UPLOAD_CHUNK_ALIGNMENT),
+        ]:
+            service = YouTubeService(config=Settings(youtube={"chunk_size": configured}))
+            assert service._upload_chunk_size() == expected
+
+    def test_credentials_are_read_once_per_file_version(self, tmp_path, monkeypatch):
+        """Test that saved credentials are parsed once until the file changes."""
+        creds_path = tmp_path / "youtube_credentials.json"
+        info = {
+            "token": "t1",
+            "refresh_token": "r",
+            "client_id": "id",
+            "client_secret": "s",
+            "expiry": "2999-01-01T00:00:00Z",
+        }
+        creds_path.write_text(json.dumps(info))
+        reads = []
+        real_loads = youtube_service.orjson.loads
+        monkeypatch.setattr(
+            youtube_service.orjson, "loads", lambda data: reads.append(data) or real_loads(data)
+        )
+
+        def load_token():
+            service = YouTubeService(config=Settings())
+            service._credentials_path = creds_path
+            assert service._get_credentials() is service._get_credentials()
+            return service._get_credentials().token
+
+        assert load_token() == "t1"
+        assert load_token() == "t1"
+        assert len(reads) == 1
+
+        creds_path.write_text(json.dumps({**info, "token": "t2"}))
+        os.utime(creds_path, ns=(0, creds_path.stat().st_mtime_ns + 1))
+        assert load_token() == "t2"
+        assert len(reads) == 2
+
+    def test_save_credentials_is_private_and_round_trips(self, tmp_path):
+        """Test that saved credentials are user-only and load back."""
+        from google.oauth2.credentials import Credentials
+
+        service = YouTubeService(config=Settings())
+        service._credentials_path = tmp_path / "creds" / "youtube_credentials.json"
+        credentials = Credentials(
+            "token", refresh_token="r", client_id="id", client_secret="s", scopes=["scope"]
+        )
+
+        service._save_credentials(credentials)
+
+        path = service._credentials_path
+        assert path.stat().st_mode & 0o777 == 0o600
+        assert json.loads(path.read_text())["refresh_token"] == "r"
+        assert [p.name for p in path.parent.iterdir()] == [path.name]
+
+    def test_small_thumbnail_is_sent_from_memory(self, tmp_path):
+        """Test that a small thumbnail is read once and sent in a single request."""
+        from googleapiclient.http import MediaIoBaseUpload
+
+        thumbnail_path = tmp_path / "thumbnail.png"
+        thumbnail_path.write_bytes(b"\x89PNG data")
+        thumbnails = FakeThumbnails()
+        service = YouTubeService(config=Settings())
+        service._service = SimpleNamespace(thumbnails=lambda: thumbnails)
+
+        service.set_thumbnail("abc123", thumbnail_path)
+
+        [(video_id, media)] = thumbnails.calls
+        assert video_id == "abc123"
+        assert isinstance(media, MediaIoBaseUpload)
+        assert not media.resumable()
+        assert media.getbytes(0, media.size()) == b"\x89PNG data"